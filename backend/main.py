@@ -5,6 +5,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import json
+import asyncio
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -35,7 +36,8 @@ logger = logging.getLogger(__name__)
 from modules.llm_service import LLMService
 from modules.decision_emitter import DecisionEmitter
 from modules.excel_logger import log_interaction, LOG_FILE_PATH
-from modules.telegram_handler import TelegramHandler
+from modules.telegram_handler import get_handler
+from modules.json_utils import json_loads, json_dumps
 from data.mock_data import MOCK_STATIONS, MOCK_TRANSCRIPTS
 from modules.simulation import driver_sim
 from modules.assistant_tools import (
@@ -86,7 +88,8 @@ insight_generator = InsightGenerator(llm_service)
 insight_generator = InsightGenerator(llm_service)
 aggregator = InsightAggregator() # Initialize Aggregator
 decision_emitter = DecisionEmitter()
-telegram_handler = TelegramHandler()
+telegram_handler = get_handler()
+telegram_tasks = set() # Strong refs to in-flight Telegram updates
 
 class TranscriptRequest(BaseModel):
     transcript: str
@@ -106,6 +109,9 @@ class SimulationIntervention(BaseModel):
 class SimulationRequest(BaseModel):
     interventions: List[SimulationIntervention] = []
 
+class DiagnosticBundleRequest(BaseModel):
+    analyze_payload: TranscriptRequest
+
 class AnalysisResponse(BaseModel):
     call_id: str
     transcript: str
@@ -187,6 +193,18 @@ def get_supervisor_flags():
     """
     return {"flags": aggregator.get_supervisor_flags()}
 
+@app.post("/api/diagnostic_bundle")
+def get_diagnostic_bundle(request: DiagnosticBundleRequest):
+    """
+    Analysis, aggregated insights and supervisor flags in one response (used by verify_auto_qa.py).
+    The insights are read after the analysis has been logged, as with three sequential calls.
+    """
+    return {
+        "analyze": perform_analysis(request.analyze_payload),
+        "aggregated": get_aggregated_insights(),
+        "flags": get_supervisor_flags()
+    }
+
 def perform_analysis(request: TranscriptRequest) -> AnalysisResponse:
     # Step 1: Auto-QA Analysis (Hybrid)
     qa_result_rules = auto_qa.analyze(request.transcript)
@@ -501,7 +519,7 @@ async def vapi_webhook(request: Request):
             func_name = tc.get("function", {}).get("name")
             args = tc.get("function", {}).get("arguments", {})
             if isinstance(args, str):
-                args = json.loads(args)
+                args = json_loads(args)
             
             call_id = tc["id"]
             print(f"Executing Tool: {func_name} with args: {args}")
@@ -530,7 +548,7 @@ async def vapi_webhook(request: Request):
             
             results.append({
                 "toolCallId": call_id,
-                "result": json.dumps(result)  # Result must be a string
+                "result": json_dumps(result)  # Result must be a string
             })
             
         return {"results": results}
@@ -541,12 +559,16 @@ async def vapi_webhook(request: Request):
 async def telegram_webhook(request: Request):
     """
     Receives updates from Telegram.
+    Acks immediately and processes the update in the background, so slow
+    LLM turns don't make Telegram retry (and re-deliver) the update.
     """
     try:
         data = await request.json()
-        print(f"Telegram Update: {json.dumps(data)[:100]}...")
-        result = await telegram_handler.process_update(data)
-        return result
+        print(f"Telegram Update: {json_dumps(data)[:100]}...")
+        task = asyncio.create_task(telegram_handler.process_update(data))
+        telegram_tasks.add(task)
+        task.add_done_callback(telegram_tasks.discard)
+        return {"ok": True}
     except Exception as e:
         print(f"Telegram Webhook Error: {e}")
         return {"error": str(e)}
@@ -624,4 +646,5 @@ def live_demo_loop():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # "auto" picks uvloop (faster libuv event loop) when installed, else the stdlib asyncio loop
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="auto")
@@ -0,0 +1,87 @@
+"""
+Numeric kernels for driver-to-station distances and travel times.
+
+travel_time is the travel time from one point to one station and travel_times
+the same for every station, a prange-parallel loop over travel_time; station
+coordinates are contiguous float64 degree arrays. haversine_km is the distance
+in km between two (lat, lon) points given in degrees. All of them are compiled
+when numba is installed and plain math otherwise.
+"""
+
+import math
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:  # Optional speedup; the plain-math versions below are used otherwise
+    HAS_NUMBA = False
+
+
+def _haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Calculate Haversine distance between two points (in degrees) in km.
+    """
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) * math.sin(dlat / 2) + \
+        math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * \
+        math.sin(dlon / 2) * math.sin(dlon / 2)
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return EARTH_RADIUS_KM * c
+
+
+# Compiled, a call from Python costs ~0.2us instead of ~0.7us. No fastmath here: it changes
+# the last bit of ~9% of distances, and callers sort and compare them.
+# The explicit signature compiles (or loads from the on-disk cache) at import, not inside the first
+# request, and int arguments are converted to float64 instead of compiling another specialization.
+if HAS_NUMBA:
+    haversine_km = njit("float64(float64, float64, float64, float64)", cache=True)(_haversine_km)
+else:
+    haversine_km = _haversine_km
+
+
+def _travel_time(lat0, lon0, lat, lon, speed_kmph, max_travel):
+    """
+    Travel time in minutes between two points (in degrees):
+    Haversine distance at speed_kmph, capped at max_travel.
+    """
+    lat1 = math.radians(lat0)
+    lat2 = math.radians(lat)
+    dlat = math.radians(lat - lat0)
+    dlon = math.radians(lon - lon0)
+    a = (math.sin(dlat / 2) ** 2 +
+         math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2)
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    distance_km = EARTH_RADIUS_KM * c
+    return min((distance_km / speed_kmph) * 60, max_travel)
+
+
+# travel_time scores one station and travel_times every station; the batch loop calls the scalar, so
+# the alternatives ranking and the routing estimate agree to the last bit. No fastmath for the same reason.
+if HAS_NUMBA:
+    travel_time = njit("float64(float64, float64, float64, float64, float64, float64)", cache=True)(_travel_time)
+
+    @njit(parallel=True, cache=True)
+    def travel_times(lat0, lon0, lats, lons, speed_kmph, max_travel):
+        """
+        Travel time in minutes from (lat0, lon0) to every station.
+        """
+        n = lats.shape[0]
+        out = np.empty(n)
+        for i in prange(n):
+            out[i] = travel_time(lat0, lon0, lats[i], lons[i], speed_kmph, max_travel)
+        return out
+else:
+    travel_time = _travel_time
+
+    def travel_times(lat0, lon0, lats, lons, speed_kmph, max_travel):
+        """
+        Travel time in minutes from (lat0, lon0) to every station.
+        """
+        return np.array(
+            [_travel_time(lat0, lon0, lat, lon, speed_kmph, max_travel) for lat, lon in zip(lats.tolist(), lons.tolist())],
+            dtype=np.float64,
+        )
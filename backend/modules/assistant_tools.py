@@ -1,20 +1,136 @@
 import math
+import bisect
 import requests
+from modules._geo_kernels import haversine_km
 from datetime import datetime, timedelta
 from data.mock_data import MOCK_STATIONS, MOCK_DRIVERS, MOCK_SWAP_HISTORY, MOCK_SUBSCRIPTION_PLANS, MOCK_DSK_CENTERS, ALLOWED_LEAVES_PER_MONTH
 
-def calculate_distance(lat1, lon1, lat2, lon2):
+# Haversine distance between two points in km (numba-compiled when available)
+calculate_distance = haversine_km
+
+# --- Z-order (Morton) spatial index for nearest-station lookups ---
+
+Z_BITS = 16  # Quantization bits per axis (~300m cells)
+Z_SEARCH_RADIUS_KM = 5.0  # Initial bbox half-width around the query point
+KM_PER_DEG_LAT = 110.57  # Lower bound, keeps the bbox conservative
+
+
+def _quantize(value, lo, hi):
+    """Map a coordinate onto the integer grid [0, 2^Z_BITS - 1]."""
+    cells = (1 << Z_BITS) - 1
+    q = int((value - lo) / (hi - lo) * cells)
+    return min(max(q, 0), cells)
+
+
+def _spread_bits(n):
+    """Insert a zero bit between each of the low 16 bits of n."""
+    n &= 0xFFFF
+    n = (n | (n << 8)) & 0x00FF00FF
+    n = (n | (n << 4)) & 0x0F0F0F0F
+    n = (n | (n << 2)) & 0x33333333
+    return (n | (n << 1)) & 0x55555555
+
+
+def _morton_encode(x, y):
+    """Interleave bits of x (even positions) and y (odd positions)."""
+    return _spread_bits(x) | (_spread_bits(y) << 1)
+
+
+# Lower bits belonging to the same dimension as bit i
+_DIM_LOWER = [sum(1 << j for j in range(i - 2, -1, -2)) for i in range(2 * Z_BITS)]
+
+
+def _bigmin(zval, zmin, zmax):
+    """
+    Smallest z-value > zval that lies inside the box [zmin, zmax] (Tropf & Herzog).
+    Used to jump over the stretches of the curve that leave the bbox.
     """
-    Calculate Haversine distance between two points in km.
+    bigmin = zmax
+    for i in range(2 * Z_BITS - 1, -1, -1):
+        bit = 1 << i
+        dim_lower = _DIM_LOWER[i]
+        v, lo, hi = zval & bit, zmin & bit, zmax & bit
+
+        if not v and not lo and hi:
+            bigmin = (zmin | bit) & ~dim_lower
+            zmax = (zmax & ~bit) | dim_lower
+        elif not v and lo and hi:
+            return zmin
+        elif v and not lo and not hi:
+            return bigmin
+        elif v and not lo and hi:
+            zmin = (zmin | bit) & ~dim_lower
+    return bigmin
+
+
+class _ZOrderIndex:
+    """
+    Sorted (z_value, point_idx) array over (lat, lon) points.
+    Nearest-k queries binary-search the z-range of a bbox around the query
+    and only compute haversine for points inside it.
     """
-    R = 6371  # Earth radius in km
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = math.sin(dlat/2) * math.sin(dlat/2) + \
-        math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * \
-        math.sin(dlon/2) * math.sin(dlon/2)
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    return R * c
+
+    def __init__(self, points):
+        self.points = points
+        entries = []
+        for idx, (lat, lon) in enumerate(points):
+            x, y = _quantize(lon, -180, 180), _quantize(lat, -90, 90)
+            entries.append((_morton_encode(x, y), idx, x, y))
+        entries.sort()
+        self.z_values = [e[0] for e in entries]
+        self.indices = [e[1] for e in entries]
+        self.cells = [(e[2], e[3]) for e in entries]
+
+    def _query_box(self, lat, lon, radius_km):
+        """Indices of points whose grid cell falls inside the bbox, or None if it can't be bounded."""
+        dlat = radius_km / KM_PER_DEG_LAT
+        lat_lo, lat_hi = lat - dlat, lat + dlat
+        cos_lat = math.cos(math.radians(min(max(abs(lat_lo), abs(lat_hi)), 90)))
+        if lat_lo < -90 or lat_hi > 90 or cos_lat < 1e-6:
+            return None
+        dlon = radius_km / (111.32 * cos_lat)
+        lon_lo, lon_hi = lon - dlon, lon + dlon
+        if lon_lo < -180 or lon_hi > 180:
+            return None
+
+        x_lo, x_hi = _quantize(lon_lo, -180, 180), _quantize(lon_hi, -180, 180) + 1
+        y_lo, y_hi = _quantize(lat_lo, -90, 90), _quantize(lat_hi, -90, 90) + 1
+        cells = (1 << Z_BITS) - 1
+        x_hi, y_hi = min(x_hi, cells), min(y_hi, cells)
+        zmin, zmax = _morton_encode(x_lo, y_lo), _morton_encode(x_hi, y_hi)
+
+        found = []
+        i = bisect.bisect_left(self.z_values, zmin)
+        end = bisect.bisect_right(self.z_values, zmax)
+        while i < end:
+            x, y = self.cells[i]
+            if x_lo <= x <= x_hi and y_lo <= y <= y_hi:
+                found.append(self.indices[i])
+                i += 1
+            else:
+                i = bisect.bisect_left(self.z_values, _bigmin(self.z_values[i], zmin, zmax), i + 1, end)
+        return found
+
+    def nearest(self, lat, lon, k=2):
+        """Return [(distance_km, point_idx)] for the k nearest points."""
+        radius = Z_SEARCH_RADIUS_KM
+        while radius < 2000:
+            candidates = self._query_box(lat, lon, radius)
+            if candidates is None:
+                break
+            dists = sorted(
+                (calculate_distance(lat, lon, *self.points[idx]), idx) for idx in candidates
+            )
+            # Only points within the radius are guaranteed to beat everything outside the box
+            within = [d for d in dists if d[0] <= radius]
+            if len(within) >= min(k, len(self.points)):
+                return within[:k]
+            radius *= 4
+
+        # Fallback: linear scan
+        dists = sorted((calculate_distance(lat, lon, *p), idx) for idx, p in enumerate(self.points))
+        return dists[:k]
+
 
 def get_driver_profile(phone_number: str):
     """
@@ -109,16 +225,15 @@ def get_nearest_station(lat: float = None, lon: float = None, location_name: str
     if not lat:
         return {"error": "Location not found. Please provide a known location name or coordinates."}
 
-    stations_with_dist = []
-    for stn in MOCK_STATIONS:
-        dist = calculate_distance(lat, lon, stn["location"]["lat"], stn["location"]["lon"])
-        stations_with_dist.append({**stn, "distance_km": round(dist, 1)})
-    
-    # Sort by distance
-    stations_with_dist.sort(key=lambda x: x["distance_km"])
+    # Top 2 by distance via the z-order index
+    nearest = _STATION_INDEX.nearest(lat, lon, k=2)
+    stations_with_dist = [
+        {**MOCK_STATIONS[idx], "distance_km": round(dist, 1)} for dist, idx in nearest
+    ]
     
-    # Return top 2
-    return {"stations": stations_with_dist[:2]}
+    return {"stations": stations_with_dist}
+
+_STATION_INDEX = _ZOrderIndex([(s["location"]["lat"], s["location"]["lon"]) for s in MOCK_STATIONS])
 
 def get_nearest_dsk(lat: float = None, lon: float = None, location_name: str = None):
     """
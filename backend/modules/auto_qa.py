@@ -172,9 +172,6 @@ class AutoQAAnalyzer:
     
     def _detect_routing_risk(self, transcript: str) -> Optional[Dict[str, Any]]:
         """Detect risky station routing decisions"""
-        routing_keywords = self.risk_keywords["station_routing"]
-        matches = sum(1 for keyword in routing_keywords if keyword in transcript)
-        
         # Check for mentions of busy/crowded stations
         if any(keyword in transcript for keyword in ["busy", "crowded", "long queue"]):
             return {
@@ -235,9 +232,8 @@ class AutoQAAnalyzer:
         if any(keyword in transcript for keyword in self.troubleshooting_keywords):
             return None
             
-        matches = sum(1 for keyword in self.information_keywords if keyword in transcript)
-        
-        if matches >= 1:
+        # Any single account keyword is enough, so stop at the first one
+        if any(keyword in transcript for keyword in self.information_keywords):
              return {
                 "type": "information_providing",
                 "confidence": 0.9
@@ -1,10 +1,153 @@
 
 from typing import Dict, Any, List, Optional
 import math
-import random
 import copy
 import os
 import json
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:  # Without numba the tick kernel runs as plain Python (same results, slower)
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Swap bays per station: at most this many swaps per station per minute
+SWAP_BAYS = 4
+
+# Per-station state saved in each hourly checkpoint, in row order (the charging rings follow them)
+CHECKPOINT_FIELDS = ("ready", "queue", "charge_head", "charge_count", "swaps", "lost", "wait", "idle", "util")
+
+# Per-station report columns (same names as the JSON "stations" entries); the id width is set per run
+STATION_RESULT_FIELDS = [
+    ("swaps", np.int64),
+    ("lost_swaps", np.int64),
+    ("avg_wait_time_min", np.float64),
+    ("charger_utilization_pct", np.float64),
+    ("idle_inventory_min", np.int64)
+]
+
+
+# One kernel for every station count: cache=True keeps the compiled code on disk across processes.
+# A per-N specialized (exec-generated) kernel could not be cached and would pay the ~1s compile
+# in every process to save at most the ~0.1ms the whole tick loop takes for a small network.
+@njit(cache=True, fastmath=True)
+def _simulate_ticks(ready, queue, charging, charge_head, charge_count, chargers,
+                    swaps, lost, wait, idle, util,
+                    arrival_prob, draws, charge_time, slots,
+                    snap_start, snap_queue, snap_ready, snap_lost,
+                    t_start, ckpt, ckpt_hours):
+    """
+    Minute-by-minute network simulation over flat per-station arrays (updated in place).
+    
+    Batteries on charge live in a per-station ring buffer `charging[i*slots:(i+1)*slots]`
+    starting at charge_head[i]. New batteries always join with the full charge_time and
+    charging only counts down, so the ring stays sorted: the first min(chargers, count)
+    entries are the ones closest to done, and finished ones are always at the head.
+    draws[t*n + i] is the uniform draw deciding whether a driver arrives at station i in minute t.
+    An hourly snapshot of queue/inventory/lost swaps is taken every 60 minutes from snap_start.
+    
+    Ticks run from t_start (state arrays holding the state as of that minute) to the end.
+    For the first ckpt_hours hours, the full state at the start of each hour is copied into
+    row t // 60 of ckpt, laid out as CHECKPOINT_FIELDS followed by `charging`.
+    """
+    n = len(ready)
+    ticks = len(arrival_prob)
+    width = len(CHECKPOINT_FIELDS) * n + n * slots
+    for t in range(t_start, ticks):
+        if t % 60 == 0 and t // 60 < ckpt_hours:
+            c = t // 60 * width
+            for i in range(n):
+                ckpt[c + i] = ready[i]
+                ckpt[c + n + i] = queue[i]
+                ckpt[c + 2 * n + i] = charge_head[i]
+                ckpt[c + 3 * n + i] = charge_count[i]
+                ckpt[c + 4 * n + i] = swaps[i]
+                ckpt[c + 5 * n + i] = lost[i]
+                ckpt[c + 6 * n + i] = wait[i]
+                ckpt[c + 7 * n + i] = idle[i]
+                ckpt[c + 8 * n + i] = util[i]
+            c += len(CHECKPOINT_FIELDS) * n
+            for k in range(n * slots):
+                ckpt[c + k] = charging[k]
+        
+        p = arrival_prob[t]
+        row = t * n
+        for i in range(n):
+            base = i * slots
+            
+            # 1. Process Charging
+            count = charge_count[i]
+            active = chargers[i] if chargers[i] < count else count
+            if active > 0:
+                head = charge_head[i]
+                done = 0
+                for j in range(head, head + active):
+                    k = base + (j if j < slots else j - slots)
+                    charging[k] -= 1
+                    if charging[k] <= 0:
+                        done += 1
+                if done:
+                    ready[i] += done
+                    head += done
+                    charge_head[i] = head if head < slots else head - slots
+                    charge_count[i] = count - done
+                util[i] += active
+            
+            # Track Idle Inventory
+            idle[i] += ready[i]
+            
+            # 2. Process Arrivals
+            # If Queue is huge (e.g. > 10 vehicles) OR (Queue > 5 AND No Batteries Ready) -> Lost Swap
+            if draws[row + i] < p:
+                if queue[i] > 10 or (queue[i] > 5 and ready[i] == 0):
+                    lost[i] += 1
+                else:
+                    queue[i] += 1
+            
+            # 3. Process Service (Swaps), drained batteries go on charge
+            served = queue[i] if queue[i] < ready[i] else ready[i]
+            if served > 0:
+                if served > SWAP_BAYS:
+                    served = SWAP_BAYS
+                ready[i] -= served
+                queue[i] -= served
+                swaps[i] += served
+                tail = charge_head[i] + charge_count[i]
+                for j in range(tail, tail + served):
+                    charging[base + j % slots] = charge_time
+                charge_count[i] += served
+            
+            # Accumulate wait time for everyone still in queue
+            wait[i] += queue[i]
+        
+        if t >= snap_start and (t - snap_start) % 60 == 0:
+            snap = (t - snap_start) // 60 * n
+            for i in range(n):
+                snap_queue[snap + i] = queue[i]
+                snap_ready[snap + i] = ready[i]
+                snap_lost[snap + i] = lost[i]
+
+def _run_ticks(*args):
+    """
+    Run _simulate_ticks. Compiled, it works on the arrays directly; as plain Python it is fed
+    lists (element access on lists is several times faster than on ndarrays) and the results
+    are copied back into the arrays.
+    """
+    if HAS_NUMBA:
+        _simulate_ticks(*args)
+        return
+    lists = [a.tolist() if isinstance(a, np.ndarray) else a for a in args]
+    _simulate_ticks(*lists)
+    for a, values in zip(args, lists):
+        if isinstance(a, np.ndarray):
+            a[:] = values
+
 
 class CityDigitalTwin:
     """
@@ -30,10 +173,18 @@ class CityDigitalTwin:
             ...
         ]
         """
-        self.initial_state = copy.deepcopy(stations_data)
         self.stations = {s["id"]: self._init_station_state(s) for s in stations_data}
         self.global_demand_modifier = 1.0
+        
+        # Immutable per-station baseline as flat arrays; each run copies these instead of rebuilding station dicts
+        self._baseline = {
+            "ids": list(self.stations),
+            "chargers": np.array([st["chargers"] for st in self.stations.values()], dtype=np.int64),
+            "inventory": np.array([st["initial_inventory"] for st in self.stations.values()], dtype=np.int64)
+        }
         self.simulation_duration_hours = 24
+        # Draws and hourly first-day state of the last run_simulation(checkpoint=True)
+        self._checkpoint = None
         
         # Load Real Data Config
         self.config = self._load_simulation_config()
@@ -45,6 +196,10 @@ class CityDigitalTwin:
         # Demand Curve (normalized 0-1 probability per hour)
         self.demand_curve = self.config.get("demand_curve_hourly", [])
         
+        # Base arrival probability for every minute of a day; runs only scale it by their shift_demand factors
+        self._minute_hours = np.arange(self.simulation_duration_hours * 60) / 60.0
+        self._base_arrival_prob = np.array([self._get_arrival_probability(None, h) for h in self._minute_hours.tolist()])
+        
     def _load_simulation_config(self) -> Dict[str, Any]:
         """Load calibrated parameters from JSON"""
         try:
@@ -57,31 +212,25 @@ class CityDigitalTwin:
         return {} # Fallback to defaults
 
     def _init_station_state(self, station_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Initialize dynamic state for a single station"""
+        """Station parameters with defaults filled in (dynamic state lives in arrays during a run)"""
         s = copy.deepcopy(station_data)
         # Default defaults if missing
         s.setdefault("total_slots", 15)
         s.setdefault("chargers", 12) # Increased default
         s.setdefault("initial_inventory", 10)
-        
-        # Dynamic State
-        s["inventory_ready"] = s["initial_inventory"]
-        s["inventory_charging"] = [] 
-        s["queue_length"] = 0
-        
-        # Metrics Accumulators
-        s["metrics"] = {
-            "total_swaps_fulfilled": 0,
-            "lost_swaps": 0,
-            "total_wait_time_minutes": 0,
-            "idle_inventory_minutes": 0,
-            "charger_utilization_minutes": 0
-        }
         return s
 
-    def run_simulation(self, interventions: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    def run_simulation(self, interventions: Optional[List[Dict[str, Any]]] = None,
+                       seed: Optional[int] = None, station_array: bool = False,
+                       checkpoint: bool = False) -> Dict[str, Any]:
         """
         Run the 24-hour simulation with optional interventions.
+        Pass a seed to make the arrival draws reproducible.
+        With station_array=True, "stations" is a NumPy structured array (one row per station,
+        columns "id" + STATION_RESULT_FIELDS) instead of the JSON-ready dict keyed by station id.
+        With checkpoint=True (which needs a seed, so every re-run reproduces this run's draws), the
+        draws and the hourly state of the first day are kept so that run_simulation_delta can re-run
+        demand-only variants from the first affected hour.
         
         Interventions format:
         [
@@ -90,157 +239,191 @@ class CityDigitalTwin:
             {"type": "shift_demand", "factor": 1.2, "window": (18, 20)} # +20% during 6-8 PM
         ]
         """
-        # 1. Reset State
-        self.stations = {s["id"]: self._init_station_state(s) for s in self.initial_state}
+        if checkpoint and seed is None:
+            raise ValueError("run_simulation(checkpoint=True) needs a seed so run_simulation_delta can reproduce it")
+        
+        # 1. Reset State (private copies of the baseline arrays)
+        ids = list(self._baseline["ids"])
+        chargers = self._baseline["chargers"].copy()
+        ready = self._baseline["inventory"].copy()
         self.global_demand_modifier = 1.0
         
         # 2. Apply Static Interventions (Topology changes)
         if interventions:
-            self._apply_static_interventions(interventions)
+            ids, chargers, ready = self._apply_static_interventions(interventions, ids, chargers, ready)
             
         # 3. Time-Step Loop (Minute by Minute)
-        # We simulate 24 hours = 1440 minutes
+        # We simulate 24 hours = 1440 minutes, then a second day from that end state
+        # during which hourly snapshots are captured (metrics accumulate over both)
+        n = len(ids)
+        
+        # Per-station state and metrics as flat arrays, indexed like `ids`. They stay int64: int32/int16
+        # state measured no faster (the loop is branch-bound, not memory-bound) and idle/wait overflow int16
+        state = {name: np.zeros(n, dtype=np.int64) for name in CHECKPOINT_FIELDS}
+        state["ready"] = ready
+        # Batteries are conserved (ready + charging == initial inventory), so that bounds the ring
+        slots = max(int(ready.max()) if n else 0, 1)
+        state["charging"] = np.zeros(n * slots, dtype=np.int64)
+        
+        arrival_prob = self._arrival_probabilities(interventions)
+        draws = np.random.default_rng(seed).random(len(arrival_prob) * n)
+        
+        ckpt_hours = self.simulation_duration_hours if checkpoint else 0
+        ckpt_width = len(CHECKPOINT_FIELDS) * n + n * slots
+        ckpt = np.zeros(ckpt_hours * ckpt_width, dtype=np.int64)
+        result = self._run_from(ids, chargers, state, slots, arrival_prob, draws, 0, ckpt, ckpt_hours, station_array)
+        
+        if checkpoint:
+            self._checkpoint = {
+                "seed": seed,
+                "static": self._static_interventions(interventions),
+                "arrival_prob": arrival_prob,
+                "draws": draws,
+                "slots": slots,
+                "states": ckpt.reshape(ckpt_hours, ckpt_width)
+            }
+        return result
+
+    def run_simulation_delta(self, interventions: Optional[List[Dict[str, Any]]] = None,
+                             station_array: bool = False) -> Dict[str, Any]:
+        """
+        Re-run the last run_simulation(checkpoint=True) with different demand (shift_demand) interventions.
+        
+        Both runs use the same draws and are identical up to the first minute whose arrival probability
+        changes, so the run resumes from the checkpoint of that hour instead of minute 0. The result is
+        the same as run_simulation(interventions, seed=<checkpointed seed>). If the static (topology)
+        interventions differ from the checkpointed run, this falls back to a full run with that seed.
+        """
+        base = self._checkpoint
+        if base is None:
+            raise ValueError("run_simulation(checkpoint=True) must be called before run_simulation_delta")
+        if self._static_interventions(interventions) != base["static"]:
+            return self.run_simulation(interventions, seed=base["seed"], station_array=station_array)
+        
+        ids = list(self._baseline["ids"])
+        chargers = self._baseline["chargers"].copy()
+        if interventions:
+            ids, chargers, _ = self._apply_static_interventions(
+                interventions, ids, chargers, self._baseline["inventory"].copy()
+            )
+        n = len(ids)
+        
+        # Both days use the same daily curve, so any change shows up first on day one
+        arrival_prob = self._arrival_probabilities(interventions)
         minutes_total = self.simulation_duration_hours * 60
+        changed = np.flatnonzero(arrival_prob[:minutes_total] != base["arrival_prob"][:minutes_total])
+        hour = min(int(changed[0]) // 60 if changed.size else self.simulation_duration_hours, self.simulation_duration_hours - 1)
+        
+        # Restore the state at the start of that hour
+        row = base["states"][hour]
+        state = {name: row[k * n:(k + 1) * n].copy() for k, name in enumerate(CHECKPOINT_FIELDS)}
+        state["charging"] = row[len(CHECKPOINT_FIELDS) * n:].copy()
+        
+        return self._run_from(
+            ids, chargers, state, base["slots"], arrival_prob, base["draws"],
+            hour * 60, np.zeros(0, dtype=np.int64), 0, station_array
+        )
+
+    def _arrival_probabilities(self, interventions: Optional[List[Dict[str, Any]]]) -> np.ndarray:
+        """Network-wide arrival probability for every minute of the two simulated days"""
+        # Arrival probability depends only on the minute, so it is one curve for all stations
+        day_prob = self._base_arrival_prob * self._get_demand_modifiers(interventions)
+        return np.concatenate([day_prob, day_prob])
+
+    def _static_interventions(self, interventions: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """The topology-changing part of an intervention list (everything except shift_demand)"""
+        return [a for a in interventions or [] if a["type"] != "shift_demand"]
+
+    def _run_from(self, ids: List[str], chargers: np.ndarray, state: Dict[str, np.ndarray], slots: int,
+                  arrival_prob: np.ndarray, draws: np.ndarray, t_start: int,
+                  ckpt: np.ndarray, ckpt_hours: int, station_array: bool) -> Dict[str, Any]:
+        """Run the tick kernel from minute t_start on the given state, then build the report"""
+        n = len(ids)
+        minutes_total = self.simulation_duration_hours * 60
+        snap_queue, snap_ready, snap_lost = (np.zeros(self.simulation_duration_hours * n, dtype=np.int64) for _ in range(3))
+        
+        if n:
+            _run_ticks(
+                state["ready"], state["queue"], state["charging"], state["charge_head"], state["charge_count"], chargers,
+                state["swaps"], state["lost"], state["wait"], state["idle"], state["util"],
+                arrival_prob, draws, self.CHARGE_TIME_MINUTES, slots,
+                minutes_total, snap_queue, snap_ready, snap_lost,
+                t_start, ckpt, ckpt_hours
+            )
         
-        for minute in range(minutes_total):
-            current_hour = minute / 60.0
-            
-            # Apply Dynamic Interventions (Demand shifts)
-            demand_mod = self._get_current_demand_modifier(current_hour, interventions)
-            
-            for station_id, station in self.stations.items():
-                self._simulate_station_step(station, minute, current_hour, demand_mod)
-                
         # 4. Aggregated Results
         
-        # Time-Series Capture
+        # Time-Series Capture (state every hour of the second day, at minute 0, 60, 120...)
         time_series = []
-        
-        for minute in range(minutes_total):
-            current_hour = minute / 60.0
-            
-            # Apply Dynamic Interventions (Demand shifts)
-            demand_mod = self._get_current_demand_modifier(current_hour, interventions)
-            
-            for station_id, station in self.stations.items():
-                self._simulate_station_step(station, minute, current_hour, demand_mod)
-            
-            # Capture state every hour (at minute 0, 60, 120...)
-            if minute % 60 == 0:
-                snapshot = {
-                    "hour": int(current_hour),
-                    "stations": {
-                        sid: {
-                            "queue": st["queue_length"],
-                            "inventory": st["inventory_ready"],
-                            "load": st["metrics"]["lost_swaps"] # Accumulating lost swaps
-                        } for sid, st in self.stations.items()
-                    }
+        for hour in range(self.simulation_duration_hours):
+            row = hour * n
+            time_series.append({
+                "hour": hour,
+                "stations": {
+                    sid: {
+                        "queue": int(snap_queue[row + i]),
+                        "inventory": int(snap_ready[row + i]),
+                        "load": int(snap_lost[row + i]) # Accumulating lost swaps
+                    } for i, sid in enumerate(ids)
                 }
-                time_series.append(snapshot)
-                
+            })
+        
+        metrics = {
+            "total_swaps_fulfilled": state["swaps"],
+            "lost_swaps": state["lost"],
+            "total_wait_time_minutes": state["wait"],
+            "idle_inventory_minutes": state["idle"],
+            "charger_utilization_minutes": state["util"]
+        }
         return {
-            **self._generate_report(),
+            **self._generate_report(ids, chargers, metrics, station_array),
             "time_series": time_series
         }
 
-    def _apply_static_interventions(self, interventions: List[Dict[str, Any]]):
-        """Apply structural changes before sim starts"""
+    def _apply_static_interventions(self, interventions: List[Dict[str, Any]], ids: List[str],
+                                    chargers: np.ndarray, ready: np.ndarray):
+        """Apply structural changes before sim starts (returns the updated ids, chargers and inventory)"""
         for action in interventions:
             if action["type"] == "add_station":
-                data = action["data"]
-                self.stations[data["id"]] = self._init_station_state(data)
+                data = self._init_station_state(action["data"])
+                if data["id"] in ids:
+                    # Re-adding an existing station replaces it in place
+                    i = ids.index(data["id"])
+                    chargers[i] = data["chargers"]
+                    ready[i] = data["initial_inventory"]
+                else:
+                    ids.append(data["id"])
+                    chargers = np.concatenate([chargers, np.array([data["chargers"]], dtype=np.int64)])
+                    ready = np.concatenate([ready, np.array([data["initial_inventory"]], dtype=np.int64)])
                 
             elif action["type"] == "remove_station":
                 sid = action.get("station_id")
-                if sid in self.stations:
-                    del self.stations[sid]
+                if sid in ids:
+                    i = ids.index(sid)
+                    del ids[i]
+                    chargers = np.delete(chargers, i)
+                    ready = np.delete(ready, i)
                     
             elif action["type"] == "modify_chargers":
                 sid = action.get("station_id")
-                if sid in self.stations:
-                    self.stations[sid]["chargers"] = action["count"]
+                if sid in ids:
+                    chargers[ids.index(sid)] = action["count"]
+        
+        return ids, chargers, ready
 
-    def _get_current_demand_modifier(self, hour: float, interventions: Optional[List[Dict[str, Any]]]) -> float:
-        """Calculate demand multiplier for current time"""
-        base_mod = 1.0
+    def _get_demand_modifiers(self, interventions: Optional[List[Dict[str, Any]]]) -> np.ndarray:
+        """Calculate the demand multiplier for every minute of the day"""
+        base_mod = np.ones(len(self._minute_hours))
         
         if interventions:
             for action in interventions:
                 if action["type"] == "shift_demand":
                     start, end = action.get("window", (0, 24))
-                    if start <= hour < end:
-                        base_mod *= action.get("factor", 1.0)
+                    base_mod[(start <= self._minute_hours) & (self._minute_hours < end)] *= action.get("factor", 1.0)
                         
         return base_mod
 
-    def _simulate_station_step(self, station: Dict[str, Any], minute: int, hour: float, demand_mod: float):
-        """Simulate one minute for one station"""
-        
-        # 1. Process Charging
-        chargers_available = station["chargers"]
-        active_charging_count = 0
-        
-        # Sort charging batteries: those closest to done get priority if chargers limited
-        # (Though in reality chargers are 1:1 usually, let's assume smart allocation)
-        station["inventory_charging"].sort()
-        
-        next_charging_state = []
-        for time_left in station["inventory_charging"]:
-            if chargers_available > 0:
-                chargers_available -= 1
-                active_charging_count += 1
-                new_time = time_left - 1
-                
-                if new_time <= 0:
-                    station["inventory_ready"] += 1
-                else:
-                    next_charging_state.append(new_time)
-            else:
-                next_charging_state.append(time_left)
-                
-        station["inventory_charging"] = next_charging_state
-        station["metrics"]["charger_utilization_minutes"] += active_charging_count
-        
-        # Track Idle Inventory
-        if station["inventory_ready"] > 0:
-            station["metrics"]["idle_inventory_minutes"] += station["inventory_ready"]
-
-        # 2. Process Arrivals
-        arrival_prob = self._get_arrival_probability(station, hour) * demand_mod
-        
-        if random.random() < arrival_prob:
-            # Check capacity before joining queue
-            # If Queue is huge (e.g. > 10 vehicles) OR (Queue > 5 AND No Batteries Ready) -> Lost Swap
-            if station["queue_length"] > 10 or (station["queue_length"] > 5 and station["inventory_ready"] == 0):
-                station["metrics"]["lost_swaps"] += 1
-            else:
-                station["queue_length"] += 1
-
-        # 3. Process Service (Swaps)
-        # Service rate: assume station can do X swaps per minute concurrently (bays)
-        # 4 bays standard
-        bays_free = 4
-        
-        while bays_free > 0 and station["queue_length"] > 0:
-            if station["inventory_ready"] > 0:
-                # Swap happens
-                station["inventory_ready"] -= 1
-                station["queue_length"] -= 1
-                station["metrics"]["total_swaps_fulfilled"] += 1
-                
-                # Add drained battery to charging
-                station["inventory_charging"].append(self.CHARGE_TIME_MINUTES)
-                bays_free -= 1
-            else:
-                # Bays free but no batteries -> Wait
-                # Break loop, can't serve anyone else this minute
-                break
-        
-        # Accumulate wait time for everyone still in queue
-        station["metrics"]["total_wait_time_minutes"] += station["queue_length"]
-
-    def _get_arrival_probability(self, station: Dict[str, Any], hour: float) -> float:
+    def _get_arrival_probability(self, station: Optional[Dict[str, Any]], hour: float) -> float:
         """
         Get arrival probability into this minute.
         """
@@ -262,46 +445,43 @@ class CityDigitalTwin:
         
         return base_rate + morning_peak + evening_peak
 
-    def _generate_report(self) -> Dict[str, Any]:
-        """Compile final simulation statistics"""
+    def _generate_report(self, ids: List[str], chargers: np.ndarray, metrics: Dict[str, np.ndarray],
+                         station_array: bool = False) -> Dict[str, Any]:
+        """Compile final simulation statistics from the per-station metric arrays"""
+        swaps = metrics["total_swaps_fulfilled"]
+        wait = metrics["total_wait_time_minutes"]
         
+        # Derived Metrics (zero where there were no swaps / no chargers)
+        avg_wait = np.divide(wait, swaps, out=np.zeros(len(ids)), where=swaps > 0)
+        # Avoid div by zero for utilization
+        total_charger_minutes = chargers * (self.simulation_duration_hours * 60)
+        utilization_pct = np.divide(
+            metrics["charger_utilization_minutes"], total_charger_minutes,
+            out=np.zeros(len(ids)), where=total_charger_minutes > 0
+        ) * 100
+        
+        dtype = np.dtype([("id", f"U{max((len(sid) for sid in ids), default=1)}")] + STATION_RESULT_FIELDS)
+        stations = np.empty(len(ids), dtype=dtype)
+        stations["id"] = ids
+        stations["swaps"] = swaps
+        stations["lost_swaps"] = metrics["lost_swaps"]
+        # Python's round() per value, so figures match exactly what the JSON report has always shown
+        stations["avg_wait_time_min"] = [round(v, 1) for v in avg_wait.tolist()]
+        stations["charger_utilization_pct"] = [round(v, 1) for v in utilization_pct.tolist()]
+        stations["idle_inventory_min"] = metrics["idle_inventory_minutes"]
+        
+        total_swaps = int(swaps.sum())
         network_summary = {
-            "total_swaps": 0,
-            "lost_swaps": 0,
-            "avg_wait_time": 0.0,
-            "stations": {}
+            "total_swaps": total_swaps,
+            "lost_swaps": int(stations["lost_swaps"].sum()),
+            "avg_wait_time": round(int(wait.sum()) / total_swaps, 1) if total_swaps > 0 else 0.0,
+            "stations": stations
         }
         
-        total_wait_mins = 0
-        total_swaps = 0
-        
-        for sid, st in self.stations.items():
-            m = st["metrics"]
-            
-            # Derived Metrics
-            swaps = m["total_swaps_fulfilled"]
-            avg_wait = (m["total_wait_time_minutes"] / swaps) if swaps > 0 else 0
-            
-            # Avoid div by zero for utilization
-            total_charger_minutes = st["chargers"] * self.simulation_duration_hours * 60
-            utilization_pct = (m["charger_utilization_minutes"] / total_charger_minutes * 100) if total_charger_minutes > 0 else 0
-            
-            st_report = {
-                "swaps": swaps,
-                "lost_swaps": m["lost_swaps"],
-                "avg_wait_time_min": round(avg_wait, 1),
-                "charger_utilization_pct": round(utilization_pct, 1),
-                "idle_inventory_min": m["idle_inventory_minutes"]
+        if not station_array:
+            names = [name for name, _ in STATION_RESULT_FIELDS]
+            network_summary["stations"] = {
+                row[0]: dict(zip(names, row[1:])) for row in stations.tolist()
             }
             
-            network_summary["stations"][sid] = st_report
-            
-            network_summary["total_swaps"] += swaps
-            network_summary["lost_swaps"] += m["lost_swaps"]
-            total_wait_mins += m["total_wait_time_minutes"]
-            total_swaps += swaps
-            
-        if total_swaps > 0:
-            network_summary["avg_wait_time"] = round(total_wait_mins / total_swaps, 1)
-            
         return network_summary
@@ -43,8 +43,8 @@ class CounterfactualComparator:
         """Generate alternative routing decisions"""
         current_station_id = actual_decision.get("station_id", "A")
         
-        # Get alternative stations
-        alternatives_data = self.digital_twin.get_alternative_stations(
+        # Get the best alternative station (only the top one is used, so the full ranking is skipped)
+        best_station = self.digital_twin.best_alternative_station(
             current_station_id,
             driver_location
         )
@@ -52,8 +52,7 @@ class CounterfactualComparator:
         alternatives = []
         
         # Alternative 1: Best alternative station (lowest wait time)
-        if alternatives_data:
-            best_station = alternatives_data[0]
+        if best_station:
             alternatives.append({
                 "decision_type": "station_routing",
                 "station_id": best_station["station_id"],
@@ -107,9 +106,8 @@ class CounterfactualComparator:
         
         # Also suggest a better routing option if available
         if driver_location:
-            alternatives_data = self.digital_twin.get_alternative_stations("A", driver_location)
-            if alternatives_data:
-                best_station = alternatives_data[0]
+            best_station = self.digital_twin.best_alternative_station("A", driver_location)
+            if best_station:
                 alternatives.append({
                     "decision_type": "station_routing",
                     "station_id": best_station["station_id"],
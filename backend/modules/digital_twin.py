@@ -6,7 +6,12 @@ Models: capacity, current load, service time, distance.
 """
 
 from typing import Dict, Any, List, Optional
-import math
+import numpy as np
+from modules._geo_kernels import travel_time, travel_times
+
+# Average city speed and travel time cap used for every travel estimate
+CITY_SPEED_KMPH = 40
+MAX_TRAVEL_MINUTES = 15.0
 
 class DigitalTwinSimulator:
     """
@@ -29,6 +34,22 @@ class DigitalTwinSimulator:
         }
         """
         self.stations = {station["id"]: station for station in stations}
+        
+        # Station coordinates as contiguous degree arrays, for scoring every station in one pass
+        self._station_ids = list(self.stations)
+        self._lats = np.array([s["location"]["lat"] for s in self.stations.values()], dtype=np.float64)
+        self._lons = np.array([s["location"]["lon"] for s in self.stations.values()], dtype=np.float64)
+        
+        self._index = {sid: i for i, sid in enumerate(self._station_ids)}
+        
+        # Queue wait per station (computed exactly as _simulate_routing does). A station without
+        # capacity has no queue wait; it is left NaN so a bad row does not stop the simulator from building
+        queue_wait = [
+            (s["current_load"] / s["capacity"]) * s["avg_service_time"] if s["capacity"] else float("nan")
+            for s in self.stations.values()
+        ]
+        self._queue_wait = np.array(queue_wait, dtype=np.float64)
+        self._has_zero_capacity = bool(np.isnan(self._queue_wait).any())
     
     def simulate_decision(self, decision: Dict[str, Any], 
                          driver_location: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
@@ -62,8 +83,9 @@ class DigitalTwinSimulator:
             }
     
     def _simulate_routing(self, decision: Dict[str, Any], 
-                         driver_location: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
-        """Simulate station routing decision"""
+                         driver_location: Optional[Dict[str, float]] = None,
+                         travel_time: Optional[float] = None) -> Dict[str, Any]:
+        """Simulate station routing decision (travel_time may be precomputed by the caller)"""
         station_id = decision.get("station_id", "A")
         station = self.stations.get(station_id)
         
@@ -79,12 +101,13 @@ class DigitalTwinSimulator:
         queue_wait = load_ratio * station["avg_service_time"]
         
         # Add travel time if driver location provided
-        travel_time = 0.0
-        if driver_location:
-            travel_time = self._estimate_travel_time(
-                driver_location,
-                station["location"]
-            )
+        if travel_time is None:
+            travel_time = 0.0
+            if driver_location:
+                travel_time = self._estimate_travel_time(
+                    driver_location,
+                    station["location"]
+                )
         
         expected_wait_time = queue_wait + travel_time
         
@@ -180,54 +203,93 @@ class DigitalTwinSimulator:
         Estimate travel time using simple distance calculation.
         Uses Haversine formula for distance, then estimates time.
         """
-        # Haversine distance calculation
-        R = 6371  # Earth radius in km
-        
-        lat1 = math.radians(driver_loc["lat"])
-        lat2 = math.radians(station_loc["lat"])
-        dlat = math.radians(station_loc["lat"] - driver_loc["lat"])
-        dlon = math.radians(station_loc["lon"] - driver_loc["lon"])
-        
-        a = (math.sin(dlat / 2) ** 2 +
-             math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        
-        distance_km = R * c
-        
-        # Estimate travel time: assume average speed of 40 km/h in city
-        # Cap travel time at 15 minutes for realistic city scenarios
-        travel_time_minutes = min((distance_km / 40) * 60, 15.0)
-        
-        return travel_time_minutes
+        # Haversine distance at an average 40 km/h in the city, capped at 15 minutes
+        # for realistic city scenarios; the same function get_alternative_stations batches
+        return travel_time(
+            driver_loc["lat"], driver_loc["lon"], station_loc["lat"], station_loc["lon"],
+            CITY_SPEED_KMPH, MAX_TRAVEL_MINUTES
+        )
     
     def get_alternative_stations(self, current_station_id: str, 
                                 driver_location: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
         """Get alternative stations sorted by estimated wait time"""
         alternatives = []
         
-        for station_id, station in self.stations.items():
+        # Travel time to every station in one kernel pass instead of one haversine per station
+        travel = None
+        if driver_location:
+            travel = travel_times(
+                driver_location["lat"], driver_location["lon"],
+                self._lats, self._lons, CITY_SPEED_KMPH, MAX_TRAVEL_MINUTES
+            ).tolist()
+        
+        for i, station_id in enumerate(self._station_ids):
             if station_id == current_station_id:
                 continue
-            
-            # Create a decision for this station
-            decision = {
-                "decision_type": "station_routing",
-                "station_id": station_id
-            }
-            
-            # Simulate this station
-            result = self._simulate_routing(decision, driver_location)
-            alternatives.append({
-                "station_id": station_id,
-                "station_name": station.get("name", f"Station {station_id}"),
-                **result
-            })
+            alternatives.append(self._alternative(station_id, driver_location, travel[i] if travel is not None else None))
         
         # Sort by expected wait time
         alternatives.sort(key=lambda x: x["expected_wait_time"])
         
         return alternatives
 
+    def best_alternative_station(self, current_station_id: str,
+                                 driver_location: Optional[Dict[str, float]] = None) -> Optional[Dict[str, Any]]:
+        """
+        The first entry of get_alternative_stations(...) (None if there is none), without simulating every station.
+        """
+        if self._has_zero_capacity:
+            # No precomputed wait to rank by; the full ranking is the reference behaviour
+            alternatives = self.get_alternative_stations(current_station_id, driver_location)
+            return alternatives[0] if alternatives else None
+        
+        n = len(self._station_ids)
+        current = self._index.get(current_station_id, -1)
+        idx = np.arange(n)
+        if not driver_location:
+            travel = np.zeros(n)
+        else:
+            travel = travel_times(
+                driver_location["lat"], driver_location["lon"],
+                self._lats, self._lons, CITY_SPEED_KMPH, MAX_TRAVEL_MINUTES
+            )
+        
+        keep = idx != current
+        idx, travel = idx[keep], travel[keep]
+        if not len(idx):
+            return None
+        
+        # Same ordering as get_alternative_stations: rounded expected wait, then station order.
+        # Rounding is monotonic, so the best rounded wait is that of the lowest score, and only the
+        # distinct scores just above it need Python's round() to find which ones tie with it
+        scores = self._queue_wait[idx] + travel
+        best = round(float(scores.min()), 1)
+        close = np.unique(scores[scores <= scores.min() + 0.1 + 1e-9])
+        tied = close[[round(float(v), 1) == best for v in close]]
+        candidates = np.flatnonzero(np.isin(scores, tied))
+        c = candidates[np.argmin(idx[candidates])]
+        travel_time = float(travel[c]) if driver_location else None
+        return self._alternative(self._station_ids[int(idx[c])], driver_location, travel_time)
+
+    def _alternative(self, station_id: str, driver_location: Optional[Dict[str, float]],
+                     travel_time: Optional[float]) -> Dict[str, Any]:
+        """Simulated routing to one station, as listed by get_alternative_stations"""
+        station = self.stations[station_id]
+        
+        # Create a decision for this station
+        decision = {
+            "decision_type": "station_routing",
+            "station_id": station_id
+        }
+        
+        # Simulate this station
+        result = self._simulate_routing(decision, driver_location, travel_time)
+        return {
+            "station_id": station_id,
+            "station_name": station.get("name", f"Station {station_id}"),
+            **result
+        }
+
     def _simulate_safety(self, decision: Dict[str, Any],
                         driver_location: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
         """Simulate technical safety decision outcomes"""
@@ -0,0 +1,26 @@
+"""
+JSON helpers shared by the webhook paths.
+
+Uses orjson when installed (several times faster than stdlib json) and falls back to json otherwise.
+orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep catching the stdlib error.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used otherwise
+    orjson = None
+
+
+def json_loads(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def json_dumps(obj, indent: bool = False) -> str:
+    """Serialize obj; indent=True pretty-prints with 2 spaces (the only indent orjson supports)"""
+    if orjson:
+        # Accept non-str dict keys like stdlib json does
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode()
+    return json.dumps(obj, indent=2 if indent else None)
@@ -1,19 +1,28 @@
 import os
-from groq import Groq
+import asyncio
+import functools
+from groq import Groq, AsyncGroq
 import json
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
+from modules.json_utils import json_dumps
 
 load_dotenv()
 
+# Per-request timeout (seconds) for Groq calls
+LLM_TIMEOUT = 8.0
+
 class LLMService:
-    def __init__(self):
+    def __init__(self, timeout: float = LLM_TIMEOUT):
         api_key = os.environ.get("GROQ_API_KEY")
         if not api_key:
             print("⚠️ GROQ_API_KEY not found. LLM features will be disabled.")
             self.client = None
+            self.async_client = None
         else:
-            self.client = Groq(api_key=api_key)
+            self.client = Groq(api_key=api_key, timeout=timeout)
+            # For the async webhook paths: requests run on the event loop instead of worker threads
+            self.async_client = AsyncGroq(api_key=api_key, timeout=timeout)
             
     def analyze_call_qa(self, transcript: str, rules_detected: Dict[str, Any], sop_context: str = "") -> Dict[str, Any]:
         """
@@ -268,3 +277,42 @@ class LLMService:
         except Exception as e:
             print(f"Vision API Error: {e}")
             return "Sorry, I couldn't process the image due to a technical issue."
+
+
+class LLMCoalescer:
+    """
+    Async front end for chat.completions.create (AsyncGroq, so no worker threads).
+    Identical non-streaming requests in flight at the same time (e.g. a duplicated webhook
+    delivery) share one API call. Distinct requests are sent immediately: Groq has no
+    synchronous batch endpoint, so there is nothing to gain from waiting for company.
+    """
+
+    def __init__(self, llm_service: LLMService):
+        self.llm_service = llm_service
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    async def submit(self, **completion_kwargs):
+        """
+        Run one chat.completions.create(**completion_kwargs) call and return its result
+        (an async chunk stream when stream=True).
+        """
+        create = self.llm_service.async_client.chat.completions.create
+        if completion_kwargs.get("stream"):
+            return await create(**completion_kwargs)
+        try:
+            key = json_dumps(completion_kwargs)
+        except TypeError:  # e.g. SDK message objects in the history; just send it
+            return await create(**completion_kwargs)
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(create(**completion_kwargs))
+            self._in_flight[key] = task
+            task.add_done_callback(functools.partial(self._on_done, key))
+        # Shielded so one caller timing out doesn't cancel the call for the others
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: str, task: asyncio.Task):
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # Retrieved here in case every caller has given up
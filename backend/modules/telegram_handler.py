@@ -1,15 +1,29 @@
 import os
+import re
+import io
+import time
 import json
+import base64
+import hashlib
+import importlib.util
 import logging
-import requests
+import tempfile
+import textwrap
 import asyncio
-from typing import Dict, Any, Optional
+import functools
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Any, Optional, Tuple
+from cachetools import TTLCache
 from telegram import Update, Bot, KeyboardButton, ReplyKeyboardMarkup, ReplyKeyboardRemove
-from telegram.ext import ApplicationBuilder, ContextTypes, CommandHandler, MessageHandler, filters
+from telegram.error import BadRequest, RetryAfter
+from telegram.request import HTTPXRequest
 from deepgram import DeepgramClient
 
 # Reuse existing modules
-from modules.llm_service import LLMService
+from modules.llm_service import LLMService, LLMCoalescer
+from modules.json_utils import json_loads, json_dumps
 from modules.assistant_tools import (
     TOOLS_SCHEMA,
     get_driver_profile,
@@ -24,26 +38,254 @@ from modules.assistant_tools import (
 )
 from modules.simulation import driver_sim
 
+try:
+    from PIL import Image
+except ImportError:  # Without Pillow, photos are forwarded as-is
+    Image = None
+
+try:
+    from aiofile import async_open
+except ImportError:  # Voice cache files are read/written from a worker thread instead
+    async_open = None
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Sessions stay in process memory without it
+    aioredis = None
+
+VISION_MAX_EDGE = 1024
+VISION_JPEG_QUALITY = 80
+
+# Telegram allows roughly one edit per second per chat; deltas are coalesced to this interval
+STREAM_EDIT_INTERVAL = 1.0
+
+# Outbound timeouts (seconds) so a slow upstream can't pile up pending webhook tasks
+TELEGRAM_TIMEOUT = 10.0
+DEEPGRAM_TIMEOUT = 10.0
+RESPONSE_TIMEOUT = 15.0
+
+# One multiplexed HTTP/2 connection to api.telegram.org when h2 is installed (python-telegram-bot[http2])
+TELEGRAM_HTTP_VERSION = "2" if importlib.util.find_spec("h2") else "1.1"
+# Webhook handling runs at most MAX_CONCURRENT_UPDATES (16) updates at once, each with up to ~3 Telegram
+# calls in flight (reply + location pin, or stream edits + a background pin); 4x leaves room for background
+# sends that outlive their update. Set TELEGRAM_POOL_SIZE to raise it (PTB's Application default is 256).
+TELEGRAM_POOL_SIZE = int(os.environ.get("TELEGRAM_POOL_SIZE") or 64)
+
+# Session memory bounds: LRU over chats, and per-chat history length
+MAX_SESSIONS = 10_000
+MAX_HISTORY = 20
+PROMPT_HISTORY = 10  # Most recent messages sent to the LLM
+
+# Shared session store (only when REDIS_URL is set): idle chats expire after this many seconds
+SESSION_TTL = 3600
+
+# Replies to opening messages of unverified users are the same for everyone, so they're cached
+RESPONSE_CACHE_SIZE = 2048
+RESPONSE_CACHE_TTL = 3600
+
+# Telegram download links last about an hour; resolved File objects are reused a little under that
+FILE_CACHE_SIZE = 1024
+FILE_CACHE_TTL = 3300
+
+# Voice notes and their transcripts are kept on tmpfs (RAM-backed), so a retried or duplicated
+# update skips both the download and the Deepgram call
+VOICE_CACHE_DIR = os.environ.get("VOICE_CACHE_DIR") or (
+    "/dev/shm/voice_cache" if os.path.isdir("/dev/shm") else os.path.join(tempfile.gettempdir(), "voice_cache")
+)
+VOICE_CACHE_MAX_FILES = 2000
+
+# Updates processed concurrently; the rest wait their turn (caps parallel LLM calls)
+MAX_CONCURRENT_UPDATES = 16
+
 logger = logging.getLogger(__name__)
 
+
+def _to_jpeg_data_uri(image_bytes: bytes) -> str:
+    """
+    Downscale to VISION_MAX_EDGE on the longest side and re-encode as JPEG for the vision API.
+    """
+    if Image is not None:
+        img = Image.open(io.BytesIO(image_bytes))
+        img.thumbnail((VISION_MAX_EDGE, VISION_MAX_EDGE))
+        buffer = io.BytesIO()
+        img.convert("RGB").save(buffer, format="JPEG", quality=VISION_JPEG_QUALITY)
+        image_bytes = buffer.getvalue()
+    return "data:image/jpeg;base64," + base64.b64encode(image_bytes).decode()
+
+
+async def _read_cached(path: str) -> Optional[bytes]:
+    """Contents of a voice-cache file, or None if it isn't cached."""
+    if not os.path.exists(path):
+        return None
+    try:
+        if async_open:
+            async with async_open(path, "rb") as f:
+                return await f.read()
+        return await asyncio.to_thread(_read_bytes, path)
+    except FileNotFoundError:  # Pruned in the meantime
+        return None
+
+
+async def _write_cached(path: str, data: bytes) -> None:
+    """
+    Write a voice-cache file atomically (partial writes are never visible under the final name).
+    The cache is best-effort: failures are logged, not raised.
+    """
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique per write, so concurrent writers of the same file never share a temp file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        os.close(fd)
+        if async_open:
+            async with async_open(tmp_path, "wb") as f:
+                await f.write(data)
+        else:
+            await asyncio.to_thread(_write_bytes, tmp_path, data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.error(f"Voice cache write failed for {path}: {e}")
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _prune_voice_cache() -> None:
+    """Drop the oldest cache files once there are more than VOICE_CACHE_MAX_FILES (tmpfs is RAM)."""
+    try:
+        entries = [e for e in os.scandir(VOICE_CACHE_DIR) if e.is_file()]
+    except FileNotFoundError:
+        return
+    if len(entries) <= VOICE_CACHE_MAX_FILES:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    for entry in entries[:len(entries) - VOICE_CACHE_MAX_FILES]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+@dataclass(slots=True)
+class _ToolFn:
+    name: str
+    arguments: str
+
+@dataclass(slots=True)
+class _ToolCall:
+    """Stand-in for a structured tool call parsed from text-form <function=...> markup."""
+    id: str
+    function: _ToolFn
+
+
+# Trivial messages answered without an LLM round trip
+_GREETING_RE = re.compile(r"^\s*(/start|नमस्ते|namaste|hi|hello|hey|hola|राजू|raju)\s*[!?.,]*\s*$", re.IGNORECASE)
+_THANKS_RE = re.compile(r"^\s*(thanks|thank\s*you|thx|धन्यवाद|shukriya|शुक्रिया)\s*[!?.,]*\s*$", re.IGNORECASE)
+# Text-form tool calls some models emit instead of structured tool_calls
+_TOOL_CALL_RE = re.compile(r"<function=(\w+)>(.*?)</function>", re.DOTALL)
+# Looser variant for stripping any leftover call markup from a plain reply
+_TOOL_MARKUP_RE = re.compile(r"<function=.*?>.*?</function>", re.DOTALL)
+
+# Plain acknowledgements, the only turns (with greetings / thanks) sent without the tool schema
+_ACK_RE = re.compile(
+    r"^\s*(ok|okay|k|theek\s*hai|thik\s*hai|ठीक\s*है|haan|han|ha|हाँ|हां|ji|जी|accha|achha|acha|अच्छा|"
+    r"hmm+|yes|no|nahi|नहीं|bye|alvida|👍|🙏)(\s+(ji|जी|sir|सर))?\s*[!?.,]*\s*$",
+    re.IGNORECASE
+)
+# Tool intents in the bot's previous message: an acknowledgement answering such a question keeps the tools
+_TOOL_KEYWORDS_RE = re.compile(
+    r"station|स्टेशन|dsk|nearest|नज़दीक|नजदीक|paas|पास|location|लोकेशन|nagar|नगर|"
+    r"plan|प्लान|price|कीमत|balance|बैलेंस|profile|swap|स्वैप|history|invoice|recharge|"
+    r"\bid\b|आईडी|verify|\bD\s*\d{3,}|penalty|पेनल्टी|leave|chhutti|छुट्टी|"
+    r"issue|problem|dikkat|दिक्कत|kharab|खराब|battery|बैटरी|charg|smoke|broken|"
+    r"agent|human|senior|manager|complaint|शिकायत|"
+    # Account / payment problems (need verify_driver_by_id or report_issue)
+    r"payment|पेमेंट|भुगतान|paisa|paise|पैसा|पैसे|refund|रिफंड|wapas|वापस|\bkat\b|\bkata\b|कट|deduct|"
+    r"account|अकाउंट|खाता|khata|\bband\b|बंद|\bbill|बिल|galat|गलत|wallet|वॉलेट|\bupi\b|transaction|"
+    # Frustration / escalation (escalate_to_agent is called IMMEDIATELY for these)
+    r"bakwas|बकवास|bekar|बेकार|ghatiya|घटिया|worst|pathetic|useless|fraud|फ्रॉड|\bchor|चोर|"
+    r"gussa|गुस्सा|angry|baat\s*kara|बात\s*करा|supervisor|customer\s*care",
+    re.IGNORECASE
+)
+# Static prompt pieces (dedented once at import). The per-turn context goes last so every
+# turn shares the longest possible constant prefix for server-side prompt caching.
+_CONVERSATION_GUIDELINES = textwrap.dedent("""
+    **CONVERSATION GUIDELINES**:
+    1. **BE CONVERSATIONAL**: First acknowledge and address the user's concern/question in natural Hindi.
+    2. **EMPATHY FIRST**: If user describes a problem (smoke, damage, battery issue), address their concern and give safety advice FIRST. Do NOT immediately ask for location.
+    """)
+
+_TOOL_CONTEXT = textwrap.dedent("""\
+    **Tools**: You have access to tools. USE THEM when needed.
+    3. **LOCATION REQUEST**: If user asks for nearest station/DSK:
+       - **CHECK**: Do you know their location?
+       - **IF NO**: Call `request_user_location` tool. This sends a button to the user.
+       - **IF YES**: Call `get_nearest_station`.
+    4. **Tool Usage**:
+       - verify_driver_by_id: **MANDATORY** for any account/balance/plan query.
+       - get_driver_profile: **FORBIDDEN** until Driver ID is verified.
+       - request_user_location: Use when you need user's GPS.
+       - get_nearest_station: ONLY when you have coordinates.
+    """)
+
+# Per-turn context appended to the system prompt
+_CURRENT_CONTEXT = textwrap.dedent("""
+    **CURRENT CONTEXT**:
+    - **Customer Phone**: {user_phone} (Caller ID only)
+    - {verification_status}
+    """)
+
+_GREETING_REPLY = "नमस्ते सर! मैं राजू हूँ। बताइए क्या सेवा करूँ?"
+# First greeting of an unverified user, verbatim from the LANGUAGE SELECTION rule in the system prompt
+_LANGUAGE_GREETING = "Namaste Sir! Main Raju, Battery Smart se. Aap kis bhaasha mein baat karna chahenge: Hindi, English, Bangla, ya Marathi?"
+_THANKS_REPLY = "आपका स्वागत है सर! और कोई सेवा हो तो बताइए। 🙏"
+
+# Tools whose side effect is the whole reply, so no second LLM call is needed after them
+TERMINAL_TOOLS = {"request_user_location"}
+_DEVANAGARI_RE = re.compile(r"[\u0900-\u097F]")
+# Answers to the LANGUAGE SELECTION question (or a later switch), checked on short messages only
+_LANGUAGE_CHOICE_WORDS = 5
+_LANGUAGE_CHOICES = {
+    "hi": re.compile(r"\bhindi\b|हिंदी|हिन्दी", re.IGNORECASE),
+    "en": re.compile(r"\b(english|angrezi)\b|अंग्रेज़ी|अंग्रेजी|इंग्लिश", re.IGNORECASE),
+    "bn": re.compile(r"\b(bangla|bengali)\b|বাংলা", re.IGNORECASE),
+    "mr": re.compile(r"\bmarathi\b|मराठी", re.IGNORECASE),
+}
+# Templated tool replies exist for these languages; other sessions get the LLM's phrasing
+_STATION_TEMPLATES = {
+    "hi": "नमस्ते सर! नज़दीकी स्टेशन: {name} ({distance} km दूर).\n\n📍 पिन भेज रहा हूँ।",
+    "en": "Sir, your nearest station is {name} ({distance} km away).\n\n📍 Sending you the pin.",
+}
+_PLAN_TEMPLATES = {  # (heading, line, unlimited swaps)
+    "hi": ("सर, हमारे प्लान:", "• {name}: ₹{price} / {days} दिन, {swaps} स्वैप", "अनलिमिटेड"),
+    "en": ("Sir, our plans:", "• {name}: ₹{price} / {days} days, {swaps} swaps", "Unlimited"),
+}
+_LOCATION_PROMPT = "📍 Kripya button dabakar apni location share karein 👇"
+_LOCATION_PROMPT_HINDI = "📍 कृपया बटन दबाकर अपनी लोकेशन शेयर करें 👇"
+
+
+def _location_prompt(user_text: str) -> str:
+    """Location-button caption in the script the user wrote in."""
+    return _LOCATION_PROMPT_HINDI if _DEVANAGARI_RE.search(user_text) else _LOCATION_PROMPT
+
+
 class TelegramHandler:
     def __init__(self):
         self.token = os.environ.get("TELEGRAM_BOT_TOKEN")
         self.deepgram_key = os.environ.get("DEEPGRAM_API_KEY")
-        self.llm_service = LLMService()
         
-        if not self.token:
-            logger.error("TELEGRAM_BOT_TOKEN not set. Telegram features disabled.")
-            self.bot = None
-        else:
-            self.bot = Bot(token=self.token)
-            
-        if not self.deepgram_key:
-            logger.error("DEEPGRAM_API_KEY not set. Voice features disabled.")
-            self.deepgram = None
-        else:
-            self.deepgram = DeepgramClient(api_key=self.deepgram_key)
-            
         # Context system prompt for Raju
         self.system_prompt = """
         You are **Raju Rastogi**, a helpful Support Agent for 'Battery Smart'.
@@ -88,11 +330,68 @@ class TelegramHandler:
         **Tone**: Polite, Desi, Helpful.
         **Response Length**: Keep responses short (under 50 words) for chat.
         """
-        self.sessions = {}
+        self.system_prompt = textwrap.dedent(self.system_prompt)
+        self._prompt_prefix = self.system_prompt + _CONVERSATION_GUIDELINES
+        self._tool_prompt_prefix = self._prompt_prefix + _TOOL_CONTEXT
+        self.sessions = OrderedDict()  # chat_id -> session, least recently used first
+        self.response_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+        self._file_cache = TTLCache(maxsize=FILE_CACHE_SIZE, ttl=FILE_CACHE_TTL)
+        self.redis = None
+        redis_url = os.environ.get("REDIS_URL")
+        if redis_url:
+            if aioredis:
+                self.redis = aioredis.from_url(redis_url)
+            else:
+                logger.error("REDIS_URL is set but the redis package is missing. Using in-memory sessions.")
+        self._background_tasks = set()
+        self._voice_tasks: Dict[str, asyncio.Task] = {}  # In-flight transcriptions by file_unique_id
+        self._update_semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPDATES)
+
+    # Clients are built on first use, so a worker that never sees e.g. a voice note never builds that client
+    @functools.cached_property
+    def llm_service(self) -> LLMService:
+        return LLMService()
+
+    @functools.cached_property
+    def llm_coalescer(self) -> LLMCoalescer:
+        return LLMCoalescer(self.llm_service)
+
+    @functools.cached_property
+    def bot(self) -> Optional[Bot]:
+        if not self.token:
+            logger.error("TELEGRAM_BOT_TOKEN not set. Telegram features disabled.")
+            return None
+        request = HTTPXRequest(
+            connection_pool_size=TELEGRAM_POOL_SIZE,
+            read_timeout=TELEGRAM_TIMEOUT,
+            write_timeout=TELEGRAM_TIMEOUT,
+            http_version=TELEGRAM_HTTP_VERSION
+        )
+        return Bot(token=self.token, request=request)
 
-    async def process_update(self, update_data: Dict[str, Any]):
+    @functools.cached_property
+    def deepgram(self) -> Optional[DeepgramClient]:
+        if not self.deepgram_key:
+            logger.error("DEEPGRAM_API_KEY not set. Voice features disabled.")
+            return None
+        return DeepgramClient(api_key=self.deepgram_key, timeout=DEEPGRAM_TIMEOUT)
+
+    async def process_update(self, update_data: Dict[str, Any]) -> None:
         """
-        Manually process a webhook update from Telegram.
+        Process a webhook update from Telegram.
+        Runs as a background task after the webhook has been acked, so the outcome is only logged.
+        """
+        async with self._update_semaphore:
+            try:
+                result = await self._handle_update(update_data)
+            except Exception as e:
+                logger.exception(f"Telegram update failed: {e}")
+                return
+        logger.info(f"Telegram update processed: {result}")
+
+    async def _handle_update(self, update_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle a single Telegram update. Returns a status dict for logging.
         """
         if not self.bot:
             return {"error": "Bot not configured"}
@@ -108,24 +407,35 @@ class TelegramHandler:
             
             # Handle Voice
             if update.message.voice:
-                file_id = update.message.voice.file_id
-                user_text = await self._transcribe_voice(file_id)
+                voice = update.message.voice
+                user_text = await self._transcribe_voice(voice.file_id, voice.file_unique_id)
                 if not user_text:
                     await self.bot.send_message(chat_id=chat_id, text="माफ़ कीजिए सर, आवाज़ साफ़ नहीं आई। कृपया लिखकर भेजें।")
                     return {"status": "error", "reason": "transcription failed"}
 
             # Handle Photo
             elif update.message.photo:
-                # Use the largest photo available
-                photo = update.message.photo[-1]
-                file_id = photo.file_id
+                if not self.llm_service.client:
+                    await self.bot.send_message(chat_id=chat_id, text="माफ़ कीजिए सर, अभी फोटो की जाँच उपलब्ध नहीं है। कृपया लिखकर बताएं।")
+                    return {"status": "error", "reason": "vision unavailable"}
+
+                # Smallest size that still covers VISION_MAX_EDGE (sizes are ascending), else the largest
+                photo = next(
+                    (p for p in update.message.photo if max(p.width, p.height) >= VISION_MAX_EDGE),
+                    update.message.photo[-1]
+                )
                 
-                # Get File URL
-                new_file = await self.bot.get_file(file_id)
-                file_url = new_file.file_path
+                # Download once and hand the vision API inline bytes (no second CDN fetch)
+                new_file = await self._get_file(photo.file_id)
+                image_bytes = await new_file.download_as_bytearray()
+                data_uri = await asyncio.to_thread(_to_jpeg_data_uri, bytes(image_bytes))
                 
-                # Send to Vision Model
-                analysis = self.llm_service.analyze_image(file_url, "User sent this image. Analyze it in context of battery swapping or vehicle issues. Reply directly to user in Hindi.")
+                # Send to Vision Model (blocking SDK call, run off the event loop)
+                analysis = await asyncio.to_thread(
+                    self.llm_service.analyze_image,
+                    data_uri,
+                    "User sent this image. Analyze it in context of battery swapping or vehicle issues. Reply directly to user in Hindi."
+                )
                 
                 await self.bot.send_message(chat_id=chat_id, text=analysis)
                 return {"status": "success", "type": "vision", "response": analysis}
@@ -135,18 +445,19 @@ class TelegramHandler:
                 lat = update.message.location.latitude
                 lon = update.message.location.longitude
                 
-                # Call get_nearest_station directly with coordinates
-                result = get_nearest_station(lat=lat, lon=lon)
+                # Call get_nearest_station directly with coordinates (off the event loop, like the tool path)
+                result = await asyncio.to_thread(get_nearest_station, lat=lat, lon=lon)
                 
                 if "stations" in result and result["stations"]:
                     stn = result["stations"][0]
-                    # Send response
-                    await self.bot.send_message(
-                        chat_id=chat_id, 
-                        text=f"नमस्ते सर! आपके पास सबसे नज़दीक स्टेशन है:\n\n📍 **{stn['name']}**\nदूरी: {stn['distance_km']} km"
+                    # Send response and pin together (independent Telegram API calls)
+                    await asyncio.gather(
+                        self.bot.send_message(
+                            chat_id=chat_id, 
+                            text=f"नमस्ते सर! आपके पास सबसे नज़दीक स्टेशन है:\n\n📍 **{stn['name']}**\nदूरी: {stn['distance_km']} km"
+                        ),
+                        self.bot.send_location(chat_id=chat_id, latitude=stn['location']['lat'], longitude=stn['location']['lon'])
                     )
-                    # Send pin
-                    await self.bot.send_location(chat_id=chat_id, latitude=stn['location']['lat'], longitude=stn['location']['lon'])
                     return {"status": "success", "type": "location", "station": stn['name']}
                 else:
                     await self.bot.send_message(chat_id=chat_id, text="माफ़ कीजिए सर, आपके आस-पास कोई स्टेशन नहीं मिला।")
@@ -161,12 +472,19 @@ class TelegramHandler:
                 return {"status": "ignored", "reason": "unsupported content"}
 
             # Generate Response (let LLM handle conversation naturally)
-            response_text = await self._generate_response(user_text, chat_id)
+            try:
+                response_text, delivered = await asyncio.wait_for(
+                    self._generate_response(user_text, chat_id), timeout=RESPONSE_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.error(f"Response generation timed out after {RESPONSE_TIMEOUT}s")
+                response_text, delivered = "माफ़ कीजिए सर, अभी सर्वर धीमा है। कृपया थोड़ी देर बाद फिर से भेजें।", False
             
             logger.info(f"Bot Response: {response_text}")
 
-            # Send Reply
-            await self.bot.send_message(chat_id=chat_id, text=response_text, reply_markup=ReplyKeyboardRemove())
+            # Send Reply (unless it was already streamed into the chat)
+            if not delivered:
+                await self.bot.send_message(chat_id=chat_id, text=response_text, reply_markup=ReplyKeyboardRemove())
             
             return {
                 "status": "success", 
@@ -178,23 +496,58 @@ class TelegramHandler:
             logger.error(f"Telegram Error: {e}")
             return {"error": str(e)}
 
-    async def _transcribe_voice(self, file_id: str) -> str:
+    async def _get_file(self, file_id: str):
+        """
+        Resolve a file_id to a downloadable File, reusing recent lookups (retries, duplicate deliveries).
+        """
+        tg_file = self._file_cache.get(file_id)
+        if tg_file is None:
+            tg_file = await self.bot.get_file(file_id)
+            self._file_cache[file_id] = tg_file
+        return tg_file
+
+    async def _transcribe_voice(self, file_id: str, file_unique_id: Optional[str] = None) -> str:
         """
         Download voice note from Telegram and transcribe using Deepgram.
+        Concurrent calls for the same voice note (duplicate deliveries, retries) share one download
+        and one transcription.
         """
+        key = file_unique_id or file_id
+        task = self._voice_tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._download_and_transcribe(file_id, key))
+            self._voice_tasks[key] = task
+            task.add_done_callback(lambda _: self._voice_tasks.pop(key, None))
+        # Shielded so one caller being cancelled doesn't cancel the shared work
+        return await asyncio.shield(task)
+
+    async def _download_and_transcribe(self, file_id: str, key: str) -> str:
+        """Transcript for one voice note, from the tmpfs cache when possible."""
+        # file_unique_id is the same for every delivery of a file (file_id may differ)
+        cache_name = re.sub(r"[^\w-]", "_", key)
+        audio_path = os.path.join(VOICE_CACHE_DIR, f"{cache_name}.ogg")
+        transcript_path = os.path.join(VOICE_CACHE_DIR, f"{cache_name}.txt")
         try:
-            # 1. Get File URL
-            new_file = await self.bot.get_file(file_id)
-            file_url = new_file.file_path
+            cached_transcript = await _read_cached(transcript_path)
+            if cached_transcript is not None:
+                logger.info(f"Voice transcript cache hit: {file_id}")
+                return cached_transcript.decode()
+
+            # 1. Get the audio (local cache, else download once and keep it for retries)
+            audio = await _read_cached(audio_path)
+            if audio is None:
+                new_file = await self._get_file(file_id)
+                audio = bytes(await new_file.download_as_bytearray())
+                await _write_cached(audio_path, audio)
+                await asyncio.to_thread(_prune_voice_cache)
             
-            # 2. Transcribe via Deepgram URL source
-            # Using Deepgram Python SDK v3 structure found via inspection
-            # self.deepgram.listen.v1.media.transcribe_url uses keyword arguments
+            # 2. Transcribe the bytes via Deepgram file upload
+            # self.deepgram.listen.v1.media.transcribe_file uses keyword arguments
             # Run in thread to avoid blocking asyncio loop
             
             response = await asyncio.to_thread(
-                self.deepgram.listen.v1.media.transcribe_url,
-                url=file_url,
+                self.deepgram.listen.v1.media.transcribe_file,
+                request=audio,
                 model="nova-2",
                 language="hi",
                 smart_format=True,
@@ -202,12 +555,88 @@ class TelegramHandler:
             
             transcript = response.results.channels[0].alternatives[0].transcript
             logger.info(f"Deepgram Transcript: {transcript}")
+            if transcript:
+                await _write_cached(transcript_path, transcript.encode())
             return transcript
 
         except Exception as e:
             logger.error(f"Transcription Error: {e}")
             return ""
 
+    async def _stream_reply(self, chat_id: int, **completion_kwargs) -> Tuple[str, bool]:
+        """
+        Stream a completion into a placeholder message, editing it as tokens arrive.
+        Returns (text, delivered). If Telegram rate-limits the edits, the placeholder is
+        removed and delivered is False so the caller sends the text normally.
+        """
+        try:
+            placeholder = await self.bot.send_message(chat_id=chat_id, text="…", reply_markup=ReplyKeyboardRemove())
+        except Exception as e:
+            logger.error(f"Failed to send stream placeholder: {e}")
+            placeholder = None
+
+        editing = placeholder is not None
+        text, shown = "", ""
+        delivered = False
+        try:
+            stream = await self.llm_coalescer.submit(stream=True, **completion_kwargs)
+            # Closing the stream releases its HTTP response, also when this is cancelled mid-stream
+            async with stream:
+                last_edit = time.monotonic()
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    text += delta
+                    if editing and time.monotonic() - last_edit >= STREAM_EDIT_INTERVAL:
+                        editing = await self._edit_placeholder(placeholder, text)
+                        shown, last_edit = text, time.monotonic()
+
+            if editing and text and text != shown:
+                editing = await self._edit_placeholder(placeholder, text)
+            # Only a complete reply counts as delivered
+            delivered = editing and bool(text)
+        finally:
+            # Also reached on cancellation (the RESPONSE_TIMEOUT wait_for in _handle_update), so a
+            # half-streamed message is removed before the caller sends its fallback
+            if placeholder is not None and not delivered:
+                try:
+                    await placeholder.delete()
+                except Exception as e:
+                    logger.error(f"Failed to delete stream placeholder: {e}")
+
+        return text, delivered
+
+    async def _edit_placeholder(self, message, text: str) -> bool:
+        """Edit the streamed message in place. Returns False once streaming should stop."""
+        try:
+            await message.edit_text(text)
+            return True
+        except RetryAfter as e:
+            logger.warning(f"Telegram edit rate-limited ({e.retry_after}s); falling back to a single send")
+        except BadRequest as e:
+            if "not modified" in str(e).lower():
+                return True
+            logger.error(f"Stream edit failed: {e}")
+        except Exception as e:
+            logger.error(f"Stream edit failed: {e}")
+        return False
+
+    def _send_background(self, coro):
+        """
+        Schedule a Telegram send without awaiting it. Failures are logged, not raised.
+        """
+        task = asyncio.create_task(coro)
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_done)
+        return task
+
+    def _on_background_done(self, task: asyncio.Task):
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Background Telegram send failed: {task.exception()}")
+
     async def _request_location(self, chat_id: int, message: str = "आपकी location भेजें 📍"):
         """
         Send a message with a location request button.
@@ -218,27 +647,205 @@ class TelegramHandler:
         keyboard = ReplyKeyboardMarkup([[location_button]], resize_keyboard=True, one_time_keyboard=True)
         await self.bot.send_message(chat_id=chat_id, text=message, reply_markup=keyboard)
 
-    def _get_session(self, chat_id: int) -> Dict[str, Any]:
+    @staticmethod
+    def _new_session() -> Dict[str, Any]:
+        return {
+            "history": deque(maxlen=MAX_HISTORY),
+            "verified": False,
+            "driver_details": None,
+            "language": None
+        }
+
+    async def _get_session(self, chat_id: int) -> Dict[str, Any]:
         """
         Get or create a session for the user.
+        With Redis, the read and the TTL refresh go out in one pipelined round trip.
         """
-        if chat_id not in self.sessions:
-            self.sessions[chat_id] = {
-                "history": [],
-                "verified": False,
-                "driver_details": None
-            }
+        if self.redis:
+            key = f"sess:{chat_id}"
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    raw, _ = await pipe.get(key).expire(key, SESSION_TTL).execute()
+                if not raw:
+                    return self._new_session()
+                session = json_loads(raw)
+                session["history"] = deque(session.get("history", []), maxlen=MAX_HISTORY)
+                return session
+            except Exception as e:
+                logger.error(f"Redis session read failed, using local memory: {e}")
+
+        if chat_id in self.sessions:
+            self.sessions.move_to_end(chat_id)
+        else:
+            if len(self.sessions) >= MAX_SESSIONS:
+                self.sessions.popitem(last=False)
+            self.sessions[chat_id] = self._new_session()
         return self.sessions[chat_id]
 
-    async def _generate_response(self, text: str, chat_id: int, user_phone: str = "+11234567890") -> str:
+    async def _save_session(self, chat_id: int, session: Dict[str, Any]) -> None:
+        """
+        Persist the session to Redis. In-memory sessions are mutated in place, so there is nothing to do.
+        """
+        if not self.redis:
+            return
+        try:
+            payload = {**session, "history": list(session["history"])}
+            await self.redis.setex(f"sess:{chat_id}", SESSION_TTL, json_dumps(payload))
+        except Exception as e:
+            logger.error(f"Redis session write failed: {e}")
+
+    def _needs_tools(self, text: str, session: Dict[str, Any]) -> bool:
+        """
+        Cheap heuristic: can this turn skip the tool schema and guidance?
+        Only confident chit-chat does (greetings, thanks, plain acknowledgements), and an acknowledgement
+        like "haan" still gets the tools when it answers a tool question. Anything the heuristic can't
+        place gets the full prompt with tools.
+        """
+        if not (_ACK_RE.match(text) or _GREETING_RE.match(text) or _THANKS_RE.match(text)):
+            return True
+        last_bot = next((m["content"] for m in reversed(session["history"]) if m["role"] == "assistant"), "")
+        return bool(last_bot and _TOOL_KEYWORDS_RE.search(last_bot))
+
+    @staticmethod
+    def _session_language(text: str, session: Dict[str, Any]) -> Optional[str]:
+        """
+        Language of this conversation: the one the user picked (remembered in the session), else Hindi
+        for Devanagari text. None when unknown, e.g. romanized text before any choice.
+        """
+        if len(text.split()) <= _LANGUAGE_CHOICE_WORDS:
+            for code, pattern in _LANGUAGE_CHOICES.items():
+                if pattern.search(text):
+                    session["language"] = code
+                    break
+        return session.get("language") or ("hi" if _DEVANAGARI_RE.search(text) else None)
+
+    def _template_response(self, func_name: str, result: Dict[str, Any], language: Optional[str]) -> Optional[str]:
+        """
+        Format a reply for deterministic tool results in the session's language.
+        Returns None when the result needs the LLM to phrase it (or there is no template for the language).
+        """
+        if func_name == "get_nearest_station" and result.get("stations") and language in _STATION_TEMPLATES:
+            stn = result["stations"][0]
+            return _STATION_TEMPLATES[language].format(name=stn["name"], distance=stn["distance_km"])
+
+        if func_name == "get_plan_details" and language in _PLAN_TEMPLATES:
+            plans = [result["plan"]] if "plan" in result else list(result.get("plans", {}).values())
+            if not plans:
+                return None
+            heading, line, unlimited = _PLAN_TEMPLATES[language]
+            lines = [heading]
+            for plan in plans:
+                swaps = unlimited if plan["swaps"] >= 999 else plan["swaps"]
+                lines.append(line.format(name=plan["name"], price=plan["price"], days=plan["validity_days"], swaps=swaps))
+            return "\n".join(lines)
+
+        return None
+
+    async def _run_tool(self, func_name: str, args: Dict[str, Any], session: Dict[str, Any],
+                        chat_id: int, user_text: str) -> Dict[str, Any]:
+        """
+        Execute one tool call. The tool functions are blocking, so they run in worker threads.
+        """
+        logger.info(f"🔧 Telegram Tool Exec: {func_name} | Args: {args}")
+        
+        result = {"error": "Function not found"}
+        
+        try:
+            # Execute Tool
+            if func_name == "verify_driver_by_id":
+                result = await asyncio.to_thread(verify_driver_by_id, args.get("driver_id"), args.get("name"))
+                # UPDATE SESSION STATE
+                if result.get("verified"):
+                    session["verified"] = True
+                    session["driver_details"] = result.get("details")
+                    logger.info(f"Session {chat_id} VERIFIED as {result.get('name')}")
+
+            elif func_name == "request_user_location":
+                # Telegram Specific: Send the button
+                # We await handling it as a side effect
+                await self._request_location(chat_id, _location_prompt(user_text))
+                result = {"status": "request_sent", "message": "Location request button sent to user."}
+
+            elif func_name == "get_driver_profile":
+                if not session["verified"]:
+                    result = {"error": "DRIVER NOT VERIFIED. Please ask user for Driver ID first."}
+                else:
+                    result = await asyncio.to_thread(get_driver_profile, args.get("phone_number"))
+                    
+            elif func_name == "get_swap_history":
+                if not session["verified"]:
+                    result = {"error": "DRIVER NOT VERIFIED. Please ask user for Driver ID first."}
+                else:
+                    result = await asyncio.to_thread(get_swap_history, args.get("phone_number"))
+
+            elif func_name == "get_nearest_station":
+                result = await asyncio.to_thread(
+                    get_nearest_station, lat=args.get("lat"), lon=args.get("lon"), location_name=args.get("location_name")
+                )
+                if "stations" in result and result["stations"]:
+                    stn = result["stations"][0]
+                    lat, lon = stn["location"]["lat"], stn["location"]["lon"]
+                    if self.bot and chat_id:
+                        # Fire the pin in the background so it overlaps with the second LLM call
+                        self._send_background(self.bot.send_location(chat_id=chat_id, latitude=lat, longitude=lon))
+
+            elif func_name == "get_nearest_dsk":
+                result = await asyncio.to_thread(
+                    get_nearest_dsk, lat=args.get("lat"), lon=args.get("lon"), location_name=args.get("location_name")
+                )
+            elif func_name == "update_driver_location":
+                result = await asyncio.to_thread(driver_sim.set_location_by_name, args.get("location_name"))
+            elif func_name == "get_plan_details":
+                result = await asyncio.to_thread(get_plan_details, args.get("plan_name"))
+            elif func_name == "check_penalty_status":
+                result = await asyncio.to_thread(check_penalty_status, args.get("phone_number"))
+            elif func_name == "report_issue":
+                result = await asyncio.to_thread(
+                    report_issue, args.get("issue_type"), args.get("description"), args.get("customer_phone")
+                )
+            elif func_name == "escalate_to_agent":
+                result = await asyncio.to_thread(escalate_to_agent, args.get("reason"), args.get("customer_phone"))
+        except Exception as e:
+            result = {"error": str(e)}
+
+        return result
+
+    async def _generate_response(self, text: str, chat_id: int, user_phone: str = "+11234567890") -> Tuple[str, bool]:
         """
         Use LLM to generate Raju's response with Tool Support and Session Memory.
+        Returns (text, delivered); delivered is True when the reply was already streamed to the chat.
         """
-        if not self.llm_service.client:
-            return "नमस्ते! अभी सर्वर व्यस्त है। (LLM Unavailable)"
+        session = await self._get_session(chat_id)
+        language = self._session_language(text, session)
 
-        session = self._get_session(chat_id)
+        # Fast path: canned replies for greetings / thanks (works even when the LLM is down)
+        canned = None
+        if _GREETING_RE.match(text):
+            canned = _GREETING_REPLY if session["verified"] else _LANGUAGE_GREETING
+        elif _THANKS_RE.match(text):
+            canned = _THANKS_REPLY
+        if canned:
+            # Kept in history so the model sees e.g. the language question when the user answers it
+            session["history"].append({"role": "user", "content": text})
+            session["history"].append({"role": "assistant", "content": canned})
+            await self._save_session(chat_id, session)
+            return canned, False
+
+        if not self.llm_service.client:
+            return "नमस्ते! अभी सर्वर व्यस्त है। (LLM Unavailable)", False
         
+        # Opening turn of an unverified user: no personal context, so the reply can be shared
+        cache_key = None
+        if not session["verified"] and not session["history"]:
+            normalized = " ".join(text.lower().split())
+            cache_key = hashlib.blake2b(f"{session['verified']}|{normalized}".encode(), digest_size=16).digest()
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                session["history"].append({"role": "user", "content": text})
+                session["history"].append({"role": "assistant", "content": cached})
+                await self._save_session(chat_id, session)
+                return cached, False
+
         try:
             # 1. Build Context Injection
             verification_status = "**STATUS**: UNVERIFIED (Ask for ID)"
@@ -246,44 +853,29 @@ class TelegramHandler:
                 d = session["driver_details"]
                 verification_status = f"**STATUS**: VERIFIED ✅\n- **Driver Name**: {d.get('name')}\n- **Driver ID**: {d.get('id')}\n- **Plan**: {d.get('plan')}"
             
-            context_injection = f"""
-            
-            **CURRENT CONTEXT**:
-            - **Customer Phone**: {user_phone} (Caller ID only)
-            - {verification_status}
-            - **Tools**: You have access to tools. USE THEM when needed.
-            
-            **CONVERSATION GUIDELINES**:
-            1. **BE CONVERSATIONAL**: First acknowledge and address the user's concern/question in natural Hindi.
-            2. **EMPATHY FIRST**: If user describes a problem (smoke, damage, battery issue), address their concern and give safety advice FIRST. Do NOT immediately ask for location.
-            3. **LOCATION REQUEST**: If user asks for nearest station/DSK:
-               - **CHECK**: Do you know their location?
-               - **IF NO**: Call `request_user_location` tool. This sends a button to the user.
-               - **IF YES**: Call `get_nearest_station`.
-            4. **Tool Usage**:
-               - verify_driver_by_id: **MANDATORY** for any account/balance/plan query.
-               - get_driver_profile: **FORBIDDEN** until Driver ID is verified.
-               - request_user_location: Use when you need user's GPS.
-               - get_nearest_station: ONLY when you have coordinates.
-            """
+            # Tool guidance is only left out for chit-chat that can't need a tool
+            use_tools = self._needs_tools(text, session)
+            prompt_prefix = self._tool_prompt_prefix if use_tools else self._prompt_prefix
+            context_injection = _CURRENT_CONTEXT.format(user_phone=user_phone, verification_status=verification_status)
             
             # 2. Build Message History
             # Start with System Prompt + Context
-            messages = [{"role": "system", "content": self.system_prompt + context_injection}]
+            messages = [{"role": "system", "content": prompt_prefix + context_injection}]
             
-            # Append Session History (Last 10 messages)
-            messages.extend(session["history"][-10:])
+            # Append Session History (Last PROMPT_HISTORY messages)
+            history = session["history"]
+            messages.extend(islice(history, max(len(history) - PROMPT_HISTORY, 0), None))
             
             # Append Current User Message
             messages.append({"role": "user", "content": text})
             
-            # 3. First Call to LLM
-            completion = self.llm_service.client.chat.completions.create(
+            # 3. First Call to LLM (tool schema only when the turn plausibly needs it)
+            tool_kwargs = {"tools": TOOLS_SCHEMA, "tool_choice": "auto"} if use_tools else {}
+            completion = await self.llm_coalescer.submit(
                 messages=messages,
                 model="llama-3.3-70b-versatile",
                 temperature=0.6,
-                tools=TOOLS_SCHEMA,
-                tool_choice="auto"
+                **tool_kwargs
             )
             
             response_message = completion.choices[0].message
@@ -292,121 +884,104 @@ class TelegramHandler:
             tool_calls = response_message.tool_calls if response_message.tool_calls else []
             
             # Fallback for text-based tool calls
-            import re
             content = response_message.content or ""
-            regex = r"<function=(\w+)>(.*?)</function>"
-            matches = re.findall(regex, content)
+            matches = _TOOL_CALL_RE.findall(content)
             
             if matches and not tool_calls:
                 logger.info(f"Found {len(matches)} text-based tool calls")
-                class MockToolCall:
-                    def __init__(self, id, name, args):
-                        self.id = id
-                        self.function = type('obj', (object,), {'name': name, 'arguments': args})
-                tool_calls = []
-                for idx, (func_name, args_str) in enumerate(matches):
-                    tool_calls.append(MockToolCall(f"call_text_{idx}", func_name, args_str))
+                tool_calls = [
+                    _ToolCall(id=f"call_text_{idx}", function=_ToolFn(func_name, args_str))
+                    for idx, (func_name, args_str) in enumerate(matches)
+                ]
             
             final_response_text = ""
+            delivered = False
 
             if tool_calls:
                 # Add the assistant's request to messages
                 messages.append(response_message)
+                executed_tools = []
                 
+                parsed_calls = []
                 for tool_call in tool_calls:
                     func_name = tool_call.function.name
                     try:
-                        args = json.loads(tool_call.function.arguments)
+                        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+                        args = json_loads(tool_call.function.arguments)
                     except json.JSONDecodeError:
                         logger.error(f"Failed to parse args for {func_name}: {tool_call.function.arguments}")
                         continue
-                    
-                    print(f"🔧 Telegram Tool Exec: {func_name} | Args: {args}")
-                    
-                    result = {"error": "Function not found"}
-                    
-                    try:
-                        # Execute Tool
-                        if func_name == "verify_driver_by_id":
-                            result = verify_driver_by_id(args.get("driver_id"), args.get("name"))
-                            # UPDATE SESSION STATE
-                            if result.get("verified"):
-                                session["verified"] = True
-                                session["driver_details"] = result.get("details")
-                                logger.info(f"Session {chat_id} VERIFIED as {result.get('name')}")
-
-                        elif func_name == "request_user_location":
-                            # Telegram Specific: Send the button
-                            # We await handling it as a side effect
-                            await self._request_location(chat_id, "📍 Kripya button dabakar apni location share karein 👇")
-                            result = {"status": "request_sent", "message": "Location request button sent to user."}
-
-                        elif func_name == "get_driver_profile":
-                            if not session["verified"]:
-                                result = {"error": "DRIVER NOT VERIFIED. Please ask user for Driver ID first."}
-                            else:
-                                result = get_driver_profile(args.get("phone_number"))
-                                
-                        elif func_name == "get_swap_history":
-                            if not session["verified"]:
-                                result = {"error": "DRIVER NOT VERIFIED. Please ask user for Driver ID first."}
-                            else:
-                                result = get_swap_history(args.get("phone_number"))
-
-                        elif func_name == "get_nearest_station":
-                            result = get_nearest_station(lat=args.get("lat"), lon=args.get("lon"), location_name=args.get("location_name"))
-                            if "stations" in result and result["stations"]:
-                                try:
-                                    stn = result["stations"][0]
-                                    lat, lon = stn["location"]["lat"], stn["location"]["lon"]
-                                    if self.bot and chat_id:
-                                        await self.bot.send_location(chat_id=chat_id, latitude=lat, longitude=lon)
-                                except Exception as e:
-                                    logger.error(f"Failed to send location pin: {e}") 
-
-                        elif func_name == "get_nearest_dsk":
-                            result = get_nearest_dsk(lat=args.get("lat"), lon=args.get("lon"), location_name=args.get("location_name"))
-                        elif func_name == "update_driver_location":
-                             loc_name = args.get("location_name")
-                             result = driver_sim.set_location_by_name(loc_name)
-                        elif func_name == "get_plan_details":
-                            result = get_plan_details(args.get("plan_name"))
-                        elif func_name == "check_penalty_status":
-                            result = check_penalty_status(args.get("phone_number"))
-                        elif func_name == "report_issue":
-                            result = report_issue(args.get("issue_type"), args.get("description"), args.get("customer_phone"))
-                        elif func_name == "escalate_to_agent":
-                            result = escalate_to_agent(args.get("reason"), args.get("customer_phone"))
-                    except Exception as e:
-                        result = {"error": str(e)}
+                    parsed_calls.append((tool_call, func_name, args))
+
+                # Verification gates the profile/history tools, so it runs first; the rest are independent
+                results = [None] * len(parsed_calls)
+                for i, (_, func_name, args) in enumerate(parsed_calls):
+                    if func_name == "verify_driver_by_id":
+                        results[i] = await self._run_tool(func_name, args, session, chat_id, text)
+                pending = [i for i, result in enumerate(results) if result is None]
+                pending_results = await asyncio.gather(
+                    *(self._run_tool(parsed_calls[i][1], parsed_calls[i][2], session, chat_id, text) for i in pending)
+                )
+                for i, result in zip(pending, pending_results):
+                    results[i] = result
+
+                # Tool messages keep the order of the model's calls
+                for (tool_call, func_name, _), result in zip(parsed_calls, results):
+                    executed_tools.append((func_name, result))
 
                     # Append tool result
                     messages.append({
                         "tool_call_id": tool_call.id,
                         "role": "tool",
                         "name": func_name,
-                        "content": json.dumps(result)
+                        "content": json_dumps(result)
                     })
                 
-                # 5. Second Call to LLM (for final answer)
-                logger.info("Sending tool results back to LLM...")
-                final_completion = self.llm_service.client.chat.completions.create(
-                    messages=messages,
-                    model="llama-3.3-70b-versatile",
-                    temperature=0.7
-                )
-                final_response_text = final_completion.choices[0].message.content
+                # 5. Deterministic single-tool results are templated directly (no second LLM call)
+                templated = self._template_response(*executed_tools[0], language) if len(executed_tools) == 1 else None
+                if executed_tools and all(name in TERMINAL_TOOLS for name, _ in executed_tools):
+                    # The location button message is the reply; sending another would drop its keyboard
+                    logger.info("Terminal tool turn, skipping second LLM call")
+                    final_response_text = _location_prompt(text)
+                    delivered = True
+                elif templated:
+                    logger.info(f"Templated response for {executed_tools[0][0]}")
+                    final_response_text = templated
+                else:
+                    # 6. Second Call to LLM (for final answer), streamed into the chat
+                    logger.info("Sending tool results back to LLM...")
+                    final_response_text, delivered = await self._stream_reply(
+                        chat_id,
+                        messages=messages,
+                        model="llama-3.3-70b-versatile",
+                        temperature=0.7
+                    )
             else:
                 # No tools, just text
-                clean_content = re.sub(r"<function=.*?>.*?</function>", "", response_message.content or "").strip()
+                clean_content = _TOOL_MARKUP_RE.sub("", response_message.content or "").strip()
                 final_response_text = clean_content
+                if cache_key is not None and final_response_text:
+                    self.response_cache[cache_key] = final_response_text
 
-            # 6. Update History
+            # 7. Update History
             session["history"].append({"role": "user", "content": text})
             session["history"].append({"role": "assistant", "content": final_response_text})
+            await self._save_session(chat_id, session)
             
-            return final_response_text
+            return final_response_text, delivered
 
         except Exception as e:
             logger.error(f"LLM Error: {e}")
-            return "माफ़ कीजिए, तकनीकी खराबी है। कृपया थोड़ी देर बाद प्रयास करें।"
+            return "माफ़ कीजिए, तकनीकी खराबी है। कृपया थोड़ी देर बाद प्रयास करें।", False
+
+
+_HANDLER: Optional[TelegramHandler] = None
+
+def get_handler() -> TelegramHandler:
+    """
+    Process-wide TelegramHandler, so the Bot/Deepgram/LLM HTTP pools are reused across webhooks.
+    """
+    global _HANDLER
+    if _HANDLER is None:
+        _HANDLER = TelegramHandler()
+    return _HANDLER
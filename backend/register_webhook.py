@@ -1,5 +1,5 @@
 import os
-import requests
+import httpx
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,12 +23,13 @@ def register_webhook():
         ngrok_url = ngrok_url[:-1]
 
     webhook_url = f"{ngrok_url}/api/telegram/webhook"
-    api_url = f"https://api.telegram.org/bot{TOKEN}/setWebhook?url={webhook_url}"
+    api_url = f"https://api.telegram.org/bot{TOKEN}/setWebhook"
 
     print(f"\nRegistering webhook: {webhook_url}...")
     
     try:
-        response = requests.get(api_url)
+        # params= URL-encodes the webhook address; bounded timeout so a bad network fails fast
+        response = httpx.get(api_url, params={"url": webhook_url}, timeout=10.0)
         data = response.json()
         
         if data.get("ok"):
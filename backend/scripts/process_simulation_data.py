@@ -1,9 +1,13 @@
 
+import numpy as np
 import pandas as pd
 import json
 import os
 import dateutil.parser
 
+# Rows read per chunk when streaming the CSV logs
+CSV_CHUNK_ROWS = 500_000
+
 def process_data():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     data_dir = os.path.join(base_dir, "data")
@@ -23,18 +27,18 @@ def process_data():
     # 1. Process Demand Curve from BatteryLogs
     try:
         print(f"Reading {battery_logs_path}...")
-        df_swaps = pd.read_csv(battery_logs_path)
-        
-        # Parse dates
-        # Assuming 'createdAt' is the swap time
-        df_swaps['dt'] = pd.to_datetime(df_swaps['createdAt'], errors='coerce')
-        df_swaps = df_swaps.dropna(subset=['dt'])
-        
-        # Extract hour (0-23)
-        df_swaps['hour'] = df_swaps['dt'].dt.hour
-        
-        # Count swaps per hour
-        hourly_counts = df_swaps['hour'].value_counts().sort_index()
+        # Stream only the timestamp column in chunks and keep a running hourly histogram,
+        # so peak memory is bounded by CSV_CHUNK_ROWS instead of the whole file
+        counts = np.zeros(24, dtype=np.float64)
+        total_swaps = 0
+        for chunk in pd.read_csv(battery_logs_path, usecols=['createdAt'], chunksize=CSV_CHUNK_ROWS):
+            # Parse dates
+            # Assuming 'createdAt' is the swap time
+            dt = pd.to_datetime(chunk['createdAt'], errors='coerce').dropna()
+            
+            # Count swaps per hour (0-23) in one pass
+            counts += np.bincount(dt.dt.hour.to_numpy(), minlength=24)
+            total_swaps += len(dt)
         
         # Normalize to probability (0.0 to 1.0 scale relative to max peak)
         # But for our sim, we need "Probability of arrival per minute"
@@ -43,16 +47,12 @@ def process_data():
         # that's 20 swaps/station/hour = 0.33 swaps/min.
         # Let's normalize to a profile shape (0-1) and let sim scale it by base rate.
         
-        if not hourly_counts.empty:
-            max_val = hourly_counts.max()
-            profile = []
-            for h in range(24):
-                count = hourly_counts.get(h, 0)
-                # Normalize: 1.0 = Peak Hour
-                profile.append(round(count / max_val, 3) if max_val > 0 else 0)
+        if counts.max() > 0:
+            # Normalize: 1.0 = Peak Hour
+            profile = (counts / counts.max()).round(3).tolist()
             
             config["demand_curve_hourly"] = profile
-            config["total_swaps_analyzed"] = int(len(df_swaps))
+            config["total_swaps_analyzed"] = total_swaps
             print("Successfully generated Demand Curve.")
             
     except Exception as e:
@@ -61,7 +61,6 @@ def process_data():
     # 2. Process Charge Time from ChargingEvents
     try:
         print(f"Reading {charging_events_path}...")
-        df_charge = pd.read_csv(charging_events_path)
         
         # We need duration.
         # columns: date,deviceId,ts,lat,lon,soc,discharging_time,charge_start_time
@@ -72,22 +71,23 @@ def process_data():
         # This implies 'discharging_time' might be 'charge_end_time' or similar in this CSV context?
         # Let's assume (discharging_time - charge_start_time) = duration
         
-        df_charge['start'] = pd.to_datetime(df_charge['charge_start_time'], errors='coerce')
-        df_charge['end'] = pd.to_datetime(df_charge['discharging_time'], errors='coerce')
-        
-        df_charge = df_charge.dropna(subset=['start', 'end'])
-        
-        # Calculate duration in minutes
-        df_charge['duration_min'] = (df_charge['end'] - df_charge['start']).dt.total_seconds() / 60
-        
-        # Filter realistic values (e.g. 10 min to 300 min) to remove outliers/bugs
-        valid_charges = df_charge[
-            (df_charge['duration_min'] > 10) & 
-            (df_charge['duration_min'] < 300)
-        ]
+        # Only a running sum/count is kept, so the filtered rows never need to be held in memory
+        duration_sum = 0.0
+        duration_count = 0
+        for chunk in pd.read_csv(charging_events_path, usecols=['charge_start_time', 'discharging_time'], chunksize=CSV_CHUNK_ROWS):
+            start = pd.to_datetime(chunk['charge_start_time'], errors='coerce')
+            end = pd.to_datetime(chunk['discharging_time'], errors='coerce')
+            
+            # Calculate duration in minutes (NaN where either timestamp failed to parse)
+            duration_min = ((end - start).dt.total_seconds() / 60).to_numpy()
+            
+            # Filter realistic values (e.g. 10 min to 300 min) to remove outliers/bugs
+            valid = duration_min[(duration_min > 10) & (duration_min < 300)]
+            duration_sum += float(valid.sum())
+            duration_count += len(valid)
         
-        if not valid_charges.empty:
-            avg_time = valid_charges['duration_min'].mean()
+        if duration_count:
+            avg_time = duration_sum / duration_count
             config["avg_charge_time_minutes"] = int(avg_time)
             print(f"Calculated Avg Charge Time: {int(avg_time)} minutes")
             
@@ -2,6 +2,10 @@
 import sys
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
 
 # Add backend to path
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
@@ -28,26 +32,78 @@ stations_data = [
     }
 ]
 
+# Read-only station baseline as one flat record per station, so workers can share a single copy
+STATION_DTYPE = np.dtype([
+    ("id", "U16"),
+    ("name", "U64"),
+    ("total_slots", np.int64),
+    ("chargers", np.int64),
+    ("initial_inventory", np.int64),
+    ("lat", np.float64),
+    ("lon", np.float64)
+])
+
+def share_stations(stations):
+    """Copy the stations into shared memory; workers get only the (name, shape) handle instead of a pickled list"""
+    arr = np.array([
+        (s["id"], s["name"], s["total_slots"], s["chargers"], s["initial_inventory"],
+         s["location"]["lat"], s["location"]["lon"])
+        for s in stations
+    ], dtype=STATION_DTYPE)
+    shm = SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=STATION_DTYPE, buffer=shm.buf)[:] = arr
+    return shm, (shm.name, arr.shape)
+
+def load_stations(handle):
+    """Attach to the shared station block and rebuild the station dicts CityDigitalTwin takes"""
+    name, shape = handle
+    shm = SharedMemory(name=name)
+    try:
+        rows = np.ndarray(shape, dtype=STATION_DTYPE, buffer=shm.buf).tolist()
+    finally:
+        shm.close()
+    return [
+        {
+            "id": sid,
+            "name": sname,
+            "total_slots": slots,
+            "chargers": chargers,
+            "initial_inventory": inventory,
+            "location": {"lat": lat, "lon": lon}
+        }
+        for sid, sname, slots, chargers, inventory, lat, lon in rows
+    ]
+
 def print_results(title, result):
-    print(f"\n--- {title} ---")
-    print(f"Total Swaps: {result['total_swaps']}")
-    print(f"Lost Swaps: {result['lost_swaps']}")
-    print(f"Avg Wait Time: {result['avg_wait_time']} min")
-    print("Starions Detail:")
-    for sid, data in result["stations"].items():
-        print(f"  {sid}: {data['swaps']} swaps, {data['lost_swaps']} lost, Wait: {data['avg_wait_time_min']}m, Util: {data['charger_utilization_pct']}%")
+    # Whole block built first and written once
+    lines = [
+        f"\n--- {title} ---",
+        f"Total Swaps: {result['total_swaps']}",
+        f"Lost Swaps: {result['lost_swaps']}",
+        f"Avg Wait Time: {result['avg_wait_time']} min",
+        "Starions Detail:"
+    ]
+    lines.extend(
+        f"  {row['id']}: {row['swaps']} swaps, {row['lost_swaps']} lost, Wait: {row['avg_wait_time_min']}m, Util: {row['charger_utilization_pct']}%"
+        for row in result["stations"]
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
 
-def main():
-    print("Initializing City Digital Twin...")
-    sim = CityDigitalTwin(stations_data)
-    
-    # 1. Base Run
-    print("\nRunning Base Simulation (24h)...")
-    base_result = sim.run_simulation()
-    print_results("BASE SCENARIO", base_result)
-    
-    # 2. Intervention: Add Station
-    print("\nRunning Intervention: New Station 'S3'...")
+# Each job builds its own twin from the shared stations so it can run in a separate worker process
+def run_base_and_surge(handle, seed):
+    """
+    Base day, then the festival surge re-run from the base's 08:00 checkpoint (run_simulation_delta).
+    Both use the same arrival draws, so the difference between them is the surge alone.
+    """
+    intervention_surge = [
+        {"type": "shift_demand", "factor": 1.5, "window": (8, 22)}
+    ]
+    twin = CityDigitalTwin(load_stations(handle))
+    base = twin.run_simulation(seed=seed, station_array=True, checkpoint=True)
+    surge = twin.run_simulation_delta(intervention_surge, station_array=True)
+    return {"BASE SCENARIO": base, "SCENARIO: FESTIVAL SURGE": surge}
+
+def run_add(handle, seed=None):
     intervention_add = [
         {
             "type": "add_station", 
@@ -59,16 +115,28 @@ def main():
             }
         }
     ]
-    interv_result = sim.run_simulation(intervention_add)
-    print_results("SCENARIO: ADD STATION S3", interv_result)
+    result = CityDigitalTwin(load_stations(handle)).run_simulation(intervention_add, seed=seed, station_array=True)
+    return {"SCENARIO: ADD STATION S3": result}
+
+JOBS = [run_base_and_surge, run_add]
+SCENARIOS = ["BASE SCENARIO", "SCENARIO: ADD STATION S3", "SCENARIO: FESTIVAL SURGE"]  # Print order
+
+def main():
+    print("Running Base, New Station 'S3' and Festival Surge (+50% Demand) scenarios in parallel (24h each)...")
     
-    # 3. Intervention: Shift Demand
-    print("\nRunning Intervention: Festival Surge (+50% Demand)...")
-    intervention_surge = [
-        {"type": "shift_demand", "factor": 1.5, "window": (8, 22)}
-    ]
-    surge_result = sim.run_simulation(intervention_surge)
-    print_results("SCENARIO: FESTIVAL SURGE", surge_result)
+    shm, handle = share_stations(stations_data)
+    try:
+        # Distinct seed per worker so the jobs draw independent arrival streams
+        with ProcessPoolExecutor(max_workers=len(JOBS)) as ex:
+            futures = [ex.submit(fn, handle, i * 2654435761) for i, fn in enumerate(JOBS, start=1)]
+            results = {}
+            for future in futures:
+                results.update(future.result())
+        for title in SCENARIOS:
+            print_results(title, results[title])
+    finally:
+        shm.close()
+        shm.unlink()
 
 if __name__ == "__main__":
     main()
@@ -3,22 +3,57 @@ Quick test script to verify all modules work correctly.
 Run with: python test_modules.py
 """
 
+import io
+import sys
+import random
+from functools import lru_cache
+
 from modules.auto_qa import AutoQAAnalyzer
 from modules.decision_extractor import DecisionExtractor
+import modules.digital_twin as digital_twin
 from modules.digital_twin import DigitalTwinSimulator
 from modules.counterfactual import CounterfactualComparator
 from modules.insight_generator import InsightGenerator
+from modules.assistant_tools import _ZOrderIndex, calculate_distance
+from modules.city_digital_twin import CityDigitalTwin
 from data.mock_data import MOCK_STATIONS, MOCK_TRANSCRIPTS
 
+# The modules hold no per-call state, so build each once and reuse it across repeated test_pipeline() runs
+@lru_cache(maxsize=1)
+def _auto_qa():
+    return AutoQAAnalyzer()
+
+@lru_cache(maxsize=1)
+def _decision_extractor():
+    return DecisionExtractor()
+
+@lru_cache(maxsize=1)
+def _digital_twin():
+    return DigitalTwinSimulator(MOCK_STATIONS)
+
+@lru_cache(maxsize=1)
+def _counterfactual():
+    return CounterfactualComparator(_digital_twin())
+
+@lru_cache(maxsize=1)
+def _insight_generator():
+    return InsightGenerator()
+
 def test_pipeline():
     """Test the complete pipeline with a sample transcript"""
-    
+    # Report is collected in a buffer and written once (also on failure)
+    out = io.StringIO()
+    try:
+        _run_pipeline(out)
+    finally:
+        sys.stdout.write(out.getvalue())
+
+def _run_pipeline(out):
     # Initialize modules
-    auto_qa = AutoQAAnalyzer()
-    decision_extractor = DecisionExtractor()
-    digital_twin = DigitalTwinSimulator(MOCK_STATIONS)
-    counterfactual = CounterfactualComparator(digital_twin)
-    insight_generator = InsightGenerator()
+    auto_qa = _auto_qa()
+    decision_extractor = _decision_extractor()
+    counterfactual = _counterfactual()
+    insight_generator = _insight_generator()
     
     # Use first sample transcript
     sample = MOCK_TRANSCRIPTS[0]
@@ -26,64 +61,174 @@ def test_pipeline():
     call_id = sample["call_id"]
     driver_location = sample.get("driver_location")
     
-    print("=" * 60)
-    print("Testing QA-Driven Digital Twin Pipeline")
-    print("=" * 60)
-    print(f"\nCall ID: {call_id}")
-    print(f"\nTranscript:\n{transcript[:200]}...")
-    print("\n" + "=" * 60)
+    print("=" * 60, file=out)
+    print("Testing QA-Driven Digital Twin Pipeline", file=out)
+    print("=" * 60, file=out)
+    print(f"\nCall ID: {call_id}", file=out)
+    print(f"\nTranscript:\n{transcript[:200]}...", file=out)
+    print("\n" + "=" * 60, file=out)
     
     # Step 1: Auto-QA
-    print("\n1. Auto-QA Analysis:")
+    print("\n1. Auto-QA Analysis:", file=out)
     qa_result = auto_qa.analyze(transcript)
-    print(f"   Issue Detected: {qa_result['issue_detected']}")
-    print(f"   Decision Type: {qa_result.get('decision_type', 'N/A')}")
-    print(f"   Reason: {qa_result.get('reason', 'N/A')}")
-    print(f"   Confidence: {qa_result.get('confidence', 0):.2f}")
+    print(f"   Issue Detected: {qa_result['issue_detected']}", file=out)
+    print(f"   Decision Type: {qa_result.get('decision_type', 'N/A')}", file=out)
+    print(f"   Reason: {qa_result.get('reason', 'N/A')}", file=out)
+    print(f"   Confidence: {qa_result.get('confidence', 0):.2f}", file=out)
     
     # Step 2: Extract decision
-    print("\n2. Decision Extraction:")
+    print("\n2. Decision Extraction:", file=out)
     actual_decision = decision_extractor.extract(transcript, qa_result, driver_location)
-    print(f"   Decision Type: {actual_decision['decision_type']}")
-    print(f"   Details: {actual_decision.get('details', {})}")
+    print(f"   Decision Type: {actual_decision['decision_type']}", file=out)
+    print(f"   Details: {actual_decision.get('details', {})}", file=out)
     
     # Step 3: Generate alternatives
-    print("\n3. Generating Alternatives:")
+    print("\n3. Generating Alternatives:", file=out)
     alternatives = []
     if qa_result.get("issue_detected"):
         alternatives = counterfactual.generate_alternatives(
             actual_decision, transcript, driver_location
         )
-        print(f"   Generated {len(alternatives)} alternatives")
+        print(f"   Generated {len(alternatives)} alternatives", file=out)
         for i, alt in enumerate(alternatives, 1):
-            print(f"   Alt {i}: {alt.get('description', 'N/A')}")
+            print(f"   Alt {i}: {alt.get('description', 'N/A')}", file=out)
     
     # Step 4: Compare
-    print("\n4. Counterfactual Comparison:")
+    print("\n4. Counterfactual Comparison:", file=out)
     if alternatives:
         comparison = counterfactual.compare(
             actual_decision, alternatives, driver_location
         )
-        print(f"   Compared {len(comparison.get('alternatives', []))} options")
+        print(f"   Compared {len(comparison.get('alternatives', []))} options", file=out)
         if comparison.get('best_option'):
             best = comparison['best_option']
-            print(f"   Best Option: {best.get('option', 'N/A')}")
-            print(f"   Wait Time: {best.get('expected_wait_time', 0)} min")
+            print(f"   Best Option: {best.get('option', 'N/A')}", file=out)
+            print(f"   Wait Time: {best.get('expected_wait_time', 0)} min", file=out)
     
     # Step 5: Generate insights
-    print("\n5. Insights Generation:")
+    print("\n5. Insights Generation:", file=out)
     insights = insight_generator.generate(
         qa_result, actual_decision,
         comparison.get('alternatives', []) if alternatives else [],
         call_id
     )
-    print(f"   Issue Summary: {insights.get('issue_summary', 'N/A')}")
-    print(f"   Recommendation: {insights.get('recommendation', 'N/A')}")
-    print(f"   Impact: {insights.get('impact_summary', 'N/A')}")
+    print(f"   Issue Summary: {insights.get('issue_summary', 'N/A')}", file=out)
+    print(f"   Recommendation: {insights.get('recommendation', 'N/A')}", file=out)
+    print(f"   Impact: {insights.get('impact_summary', 'N/A')}", file=out)
     
-    print("\n" + "=" * 60)
-    print("✅ Pipeline test completed successfully!")
-    print("=" * 60)
+    print("\n" + "=" * 60, file=out)
+    print("✅ Pipeline test completed successfully!", file=out)
+    print("=" * 60, file=out)
+
+def test_nearest_station_index():
+    """Z-order (BIGMIN) nearest search must return exactly what a full haversine scan does"""
+    rng = random.Random(7)
+    # Uniform points, dense / duplicated clusters (ties), and points near the grid edges
+    points = [(rng.uniform(-89, 89), rng.uniform(-179, 179)) for _ in range(300)]
+    for lat, lon in [(28.6, 77.2), (12.97, 77.59), (0.0, 0.0), (-33.9, 151.2)]:
+        points += [(lat + rng.gauss(0, 0.01), lon + rng.gauss(0, 0.01)) for _ in range(150)]
+        points += [(lat, lon)] * 3
+    points += [(89.9, 179.9), (-89.9, -179.9), (0.0, 179.99), (0.0, -179.99)]
+    index = _ZOrderIndex(points)
+    
+    queries = [points[rng.randrange(len(points))] for _ in range(200)]
+    queries += [(lat + rng.gauss(0, 0.05), lon + rng.gauss(0, 0.05)) for lat, lon in queries[:100]]
+    queries += [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(200)]
+    for lat, lon in queries:
+        brute = sorted((calculate_distance(lat, lon, *p), idx) for idx, p in enumerate(points))
+        for k in (1, 2, 5):
+            assert index.nearest(lat, lon, k=k) == brute[:k], (lat, lon, k)
+    print(f"✅ Nearest-station index matches brute force ({len(queries)} queries, {len(points)} points)")
+
+def test_simulation_delta():
+    """run_simulation_delta from a checkpoint must equal a full run with the checkpointed seed"""
+    twin = CityDigitalTwin(MOCK_STATIONS)
+    seed = 2654435761
+    base = twin.run_simulation(seed=seed, checkpoint=True)
+    assert base == CityDigitalTwin(MOCK_STATIONS).run_simulation(seed=seed)
+    
+    variants = [
+        [{"type": "shift_demand", "factor": 1.5, "window": (8, 22)}],
+        [{"type": "shift_demand", "factor": 0.8, "window": (18, 20)}, {"type": "shift_demand", "factor": 1.3, "window": (19, 24)}],
+        [],  # Nothing changes: resumes from the last hour
+        # Topology change: falls back to a full run with the same seed
+        [{"type": "modify_chargers", "station_id": MOCK_STATIONS[0]["id"], "count": 30},
+         {"type": "shift_demand", "factor": 1.5, "window": (8, 22)}],
+    ]
+    for interventions in variants:
+        assert twin.run_simulation_delta(interventions) == twin.run_simulation(interventions, seed=seed), interventions
+    
+    try:
+        twin.run_simulation(checkpoint=True)
+        raise AssertionError("checkpoint=True without a seed should be rejected")
+    except ValueError:
+        pass
+    print(f"✅ Simulation delta re-runs match full runs ({len(variants)} variants)")
+
+def test_best_alternative_station():
+    """best_alternative_station must equal get_alternative_stations(...)[0]"""
+    from modules._geo_kernels import travel_times
+    rng = random.Random(11)
+    # Synthetic networks too: a dense one where many stations sit at the travel cap and tie, and a
+    # sparse one where the best station is often just inside or beyond the cap
+    def network(n, spread):
+        return [
+            {"id": f"T{i}", "name": f"T{i}", "capacity": rng.choice([10, 20]), "current_load": rng.randint(0, 20),
+             "avg_service_time": rng.choice([3, 5]),
+             "location": {"lat": 28.4 + rng.random() * spread, "lon": 76.9 + rng.random() * spread}}
+            for i in range(n)
+        ]
+    checks = 0
+    for stations in (MOCK_STATIONS, network(1500, 0.6), network(60, 1.5)):
+        sim = DigitalTwinSimulator(stations)
+        lats = [s["location"]["lat"] for s in stations]
+        lons = [s["location"]["lon"] for s in stations]
+        for k in range(60):
+            loc = None if k % 10 == 0 else {
+                "lat": rng.uniform(min(lats) - 0.1, max(lats) + 0.1), "lon": rng.uniform(min(lons) - 0.1, max(lons) + 0.1)
+            }
+            current = stations[rng.randrange(len(stations))]["id"] if k % 7 else "UNKNOWN"
+            alternatives = sim.get_alternative_stations(current, loc)
+            expected = alternatives[0] if alternatives else None
+            assert sim.best_alternative_station(current, loc) == expected, (current, loc)
+            if loc is not None and k % 10 == 1:
+                # The batched ranking and the per-station routing estimate use the same distances
+                batch = travel_times(loc["lat"], loc["lon"], sim._lats, sim._lons,
+                                     digital_twin.CITY_SPEED_KMPH, digital_twin.MAX_TRAVEL_MINUTES)
+                assert batch.tolist() == [sim._estimate_travel_time(loc, s["location"]) for s in stations]
+            checks += 1
+    # A station without capacity must not stop the simulator from building
+    stations = MOCK_STATIONS + [dict(MOCK_STATIONS[0], id="ZERO", capacity=0)]
+    sim = DigitalTwinSimulator(stations)
+    assert sim.best_alternative_station("ZERO") == sim.get_alternative_stations("ZERO")[0]
+    print(f"✅ Best alternative station matches the full ranking ({checks} checks)")
+
+def test_tool_intent_heuristic():
+    """Turns that may need a tool must get the tool schema; only plain chit-chat goes without it"""
+    from modules.telegram_handler import TelegramHandler
+    handler = TelegramHandler()
+    session = handler._new_session()
+    session["history"].append({"role": "assistant", "content": "Aur kuch madad chahiye sir?"})
+    needs_tools = [
+        "mera payment kat gaya", "account band ho gaya", "bill galat hai", "paisa wapas karo",
+        "bakwas service, kisi se baat karao", "मेरा पैसा कट गया", "खाता बंद हो गया", "refund chahiye",
+        "nearest station kahan hai", "mera balance batao", "D12345", "battery kharab hai",
+        # No keyword at all: uncertain, so the full prompt
+        "mujhe samajh nahi aaya", "aap log kya karte ho", "kitna time lagega", "what is your name",
+    ]
+    no_tools = ["ok", "theek hai", "haan ji", "accha", "hmm", "ठीक है", "thank you", "namaste"]
+    for text in needs_tools:
+        assert handler._needs_tools(text, session), text
+    for text in no_tools:
+        assert not handler._needs_tools(text, session), text
+    # A bare follow-up inherits the intent of the bot's previous question
+    session["history"].append({"role": "assistant", "content": "Kripya apna Driver ID batayein."})
+    assert handler._needs_tools("haan", session)
+    print(f"✅ Tool intent heuristic ({len(needs_tools)} tool turns, {len(no_tools)} chit-chat turns)")
 
 if __name__ == "__main__":
     test_pipeline()
+    test_nearest_station_index()
+    test_simulation_delta()
+    test_best_alternative_station()
+    test_tool_intent_heuristic()
@@ -1,55 +1,109 @@
-import requests
-import json
+import asyncio
+import io
+import sys
 import time
+from urllib.parse import urlsplit
+import httpx
+from modules.json_utils import json_loads, json_dumps
 
 BASE_URL = "http://localhost:8000"
+# Analysis runs the LLM pipeline server-side; httpx's 5s default would cut it off
+REQUEST_TIMEOUT = httpx.Timeout(120.0, connect=5.0)
+JSON_HEADERS = {"Content-Type": "application/json"}
 
-def test_analyze():
-    print("Testing Analysis Endpoint...")
-    payload = {
-        "transcript": "Driver: Hello, I am at Paschim Vihar. My battery is low. Agent: Go to station BS-001. It is very busy but you can go. Driver: Okay.",
-        "call_id": "test_call_001",
-        "driver_location": {"lat": 28.6, "lon": 77.2},
-        "agent_id": "AI_TEST_01",
-        "city": "Gurgaon"
-    }
-    
+ANALYZE_PAYLOAD = {
+    "transcript": "Driver: Hello, I am at Paschim Vihar. My battery is low. Agent: Go to station BS-001. It is very busy but you can go. Driver: Okay.",
+    "call_id": "test_call_001",
+    "driver_location": {"lat": 28.6, "lon": 77.2},
+    "agent_id": "AI_TEST_01",
+    "city": "Gurgaon"
+}
+
+async def fetch_json(client, method, url, payload=None):
+    content = json_dumps(payload) if payload is not None else None
+    response = await client.request(method, url, content=content, headers=JSON_HEADERS if content else None)
+    response.raise_for_status()
+    return json_loads(response.content)
+
+# Each check takes its result from the diagnostic bundle when there is one, else calls its own endpoint
+async def test_analyze(client, bundle=None):
+    # Buffered and written in one go, so checks running concurrently don't interleave their output
+    out = io.StringIO()
+    print("Testing Analysis Endpoint...", file=out)
     try:
-        response = requests.post(f"{BASE_URL}/api/analyze", json=payload)
-        response.raise_for_status()
-        data = response.json()
-        print("Analysis Response:", json.dumps(data, indent=2)[:500] + "...")
-        print("✅ Analysis Endpoint Works")
+        data = bundle["analyze"] if bundle else await fetch_json(client, "POST", "/api/analyze", ANALYZE_PAYLOAD)
+        print("Analysis Response:", json_dumps(data, indent=True)[:500] + "...", file=out)
+        print("✅ Analysis Endpoint Works", file=out)
     except Exception as e:
-        print(f"❌ Analysis Failed: {e}")
+        print(f"❌ Analysis Failed: {e}", file=out)
+    
+    sys.stdout.write(out.getvalue())
 
-def test_aggregated_insights():
-    print("\nTesting Aggregated Insights...")
+async def test_aggregated_insights(client, bundle=None):
+    out = io.StringIO()
+    print("\nTesting Aggregated Insights...", file=out)
     try:
-        response = requests.get(f"{BASE_URL}/api/insights/aggregated")
-        response.raise_for_status()
-        data = response.json()
-        print("Aggregated Data:", json.dumps(data, indent=2))
-        print("✅ Aggregated Insights Endpoint Works")
+        data = bundle["aggregated"] if bundle else await fetch_json(client, "GET", "/api/insights/aggregated")
+        print("Aggregated Data:", json_dumps(data, indent=True), file=out)
+        print("✅ Aggregated Insights Endpoint Works", file=out)
     except Exception as e:
-        print(f"❌ Aggregated Insights Failed: {e}")
+        print(f"❌ Aggregated Insights Failed: {e}", file=out)
+    
+    sys.stdout.write(out.getvalue())
 
-def test_flags():
-    print("\nTesting Supervisor Flags...")
+async def test_flags(client, bundle=None):
+    out = io.StringIO()
+    print("\nTesting Supervisor Flags...", file=out)
     try:
-        response = requests.get(f"{BASE_URL}/api/insights/flags")
-        response.raise_for_status()
-        data = response.json()
-        print("Flags Data:", json.dumps(data, indent=2))
-        print("✅ Supervisor Flags Endpoint Works")
+        data = bundle["flags"] if bundle else await fetch_json(client, "GET", "/api/insights/flags")
+        print("Flags Data:", json_dumps(data, indent=True), file=out)
+        print("✅ Supervisor Flags Endpoint Works", file=out)
     except Exception as e:
-        print(f"❌ Supervisor Flags Failed: {e}")
+        print(f"❌ Supervisor Flags Failed: {e}", file=out)
+    
+    sys.stdout.write(out.getvalue())
+
+async def wait_for_server(url, timeout=30.0):
+    """
+    Poll until the server accepts TCP connections (uvicorn only listens once startup has finished).
+    Returns immediately when it is already up; raises TimeoutError if it never comes up.
+    """
+    parts = urlsplit(url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(parts.hostname, parts.port), 0.2)
+            writer.close()
+            await writer.wait_closed()
+            return
+        except (OSError, asyncio.TimeoutError):
+            await asyncio.sleep(0.05)
+    raise TimeoutError(f"Server at {url} not reachable after {timeout:.0f}s")
+
+async def main():
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=REQUEST_TIMEOUT) as client:
+        await wait_for_server(BASE_URL)
+        
+        # One round trip for all three checks; the server runs them in order
+        try:
+            bundle = await fetch_json(client, "POST", "/api/diagnostic_bundle", {"analyze_payload": ANALYZE_PAYLOAD})
+        except Exception as e:
+            print(f"Diagnostic bundle unavailable ({e}), checking endpoints one by one\n")
+            bundle = None
+        
+        if bundle:
+            await test_analyze(client, bundle)
+            await test_aggregated_insights(client, bundle)
+            await test_flags(client, bundle)
+            return
+        
+        # Analysis writes the interaction log the insight endpoints read, so it goes first;
+        # the two read-only checks then run concurrently on the same client
+        await test_analyze(client)
+        await asyncio.gather(
+            test_aggregated_insights(client),
+            test_flags(client)
+        )
 
 if __name__ == "__main__":
-    # Ensure server is running (user already has it running, but we might need to wait if it restarted)
-    # Since I edited main.py, uvicorn with reload might be restarting.
-    time.sleep(2) 
-    
-    test_analyze()
-    test_aggregated_insights()
-    test_flags()
+    asyncio.run(main())